@@ -0,0 +1,158 @@
+#!python3
+"""Measures the import time of the StringEx modules, which is paid on every boot of the VRNetzer and by every construct_interactomes.py process.
+
+Every entry point is imported in a fresh interpreter with -X importtime, the best of several runs is reported together with its slowest imports. The check fails, if an entry point takes longer than the budget or if it imports one of the heavy libraries which must only be loaded inside the functions that need them. Runs offline, the VRNetzer modules are replaced by the minimal stand-ins in benchmarks/host.
+
+Usage:
+    python3 benchmarks/benchmark_imports.py --budget 2.0 --output results.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules imported by src/app.py when the VRNetzer boots and by construct_interactomes.py
+ENTRY_POINTS = {
+    "extension": ["src.workflows", "src.routes", "src.send_to_cytoscape"],
+    "interactomes": [
+        "interactomes.construct_network",
+        "interactomes.upload_network",
+        "interactomes.util",
+    ],
+}
+# Libraries which must not be imported at start up
+HEAVY_MODULES = [
+    "cartoGRAPHs",
+    "dask",
+    "goatools",
+    "hdbscan",
+    "matplotlib",
+    "modin",
+    "open3d",
+    "pip",
+    "py4cytoscape",
+    "seaborn",
+    "swifter",
+    "umap",
+]
+DEFAULT_BUDGET = 2.0  # seconds
+
+
+def import_times(modules: list[str]) -> tuple[float, dict[str, float]]:
+    """Imports modules in a fresh interpreter and parses the output of -X importtime.
+
+    Args:
+        modules (list[str]): modules to import.
+
+    Raises:
+        RuntimeError: If the modules cannot be imported.
+
+    Returns:
+        tuple[float, dict[str, float]]: total import time in seconds and the cumulative import time of every module imported by the given modules in seconds.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.path.join(_DIR, "host"), os.path.join(_DIR, "..")]
+    )
+    env.setdefault("STRINGEX_BENCHMARK_PROJECTS", tempfile.gettempdir())
+    code = "import " + ", ".join(modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Could not import {modules}:\n{proc.stderr}")
+    total, times = 0.0, {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if name[1:2] != " ":
+            # Imported by the statement itself, includes all nested imports
+            total += int(cumulative) / 1e6
+        else:
+            times[name.strip()] = int(cumulative) / 1e6
+    return total, times
+
+
+def check(name: str, modules: list[str], budget: float, repeat: int, top: int) -> dict:
+    """Measures the import time of an entry point and checks it against the budget.
+
+    Args:
+        name (str): name of the entry point.
+        modules (list[str]): modules imported by the entry point.
+        budget (float): maximal import time in seconds.
+        repeat (int): number of runs, the fastest one is reported.
+        top (int): number of slowest imports which are reported.
+
+    Returns:
+        dict: results of the entry point.
+    """
+    runs = [import_times(modules) for _ in range(repeat)]
+    total, times = min(runs, key=lambda run: run[0])
+    heavy = sorted({m.split(".")[0] for m in times if m.split(".")[0] in HEAVY_MODULES})
+    slowest = sorted(times, key=times.get, reverse=True)[:top]
+    res = {
+        "entry_point": name,
+        "modules": modules,
+        "best_s": total,
+        "budget_s": budget,
+        "heavy_modules": heavy,
+        "slowest": {m: times[m] for m in slowest},
+        "passed": total <= budget and not heavy,
+    }
+    print(
+        f"{name:<14} {total:>7.3f} s (budget {budget:.3f} s) "
+        + ("ok" if res["passed"] else "FAILED"),
+        flush=True,
+    )
+    if heavy:
+        print(f"    heavy modules imported: {', '.join(heavy)}")
+    for m in slowest:
+        print(f"    {times[m]:>7.3f} s {m}")
+    return res
+
+
+def main(args: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--budget",
+        "-b",
+        type=float,
+        default=DEFAULT_BUDGET,
+        help="Maximal import time of an entry point in seconds.",
+    )
+    parser.add_argument(
+        "--repeat", "-r", type=int, default=3, help="Number of runs per entry point."
+    )
+    parser.add_argument(
+        "--top", "-t", type=int, default=10, help="Number of slowest imports to list."
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        default=None,
+        help="Write the results to this JSON file.",
+    )
+    args = parser.parse_args(args)
+    results = [
+        check(name, modules, args.budget, args.repeat, args.top)
+        for name, modules in ENTRY_POINTS.items()
+    ]
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if not all(res["passed"] for res in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
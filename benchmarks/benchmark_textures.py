@@ -0,0 +1,298 @@
+#!python3
+"""Benchmarks the texture pipeline and the project writing of the Uploader on synthetic networks.
+
+Every stage is timed, its throughput (nodes/s, links/s), its peak memory (traced with tracemalloc) and the number of bytes it wrote are reported. Runs offline, the VRNetzer modules project, GlobalData and uploader are replaced by the minimal stand-ins in benchmarks/host.
+
+Usage:
+    python3 benchmarks/benchmark_textures.py --links 1000 10000 100000 1000000 --output results.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROJECTS = tempfile.mkdtemp(prefix="stringex_benchmark_")
+os.environ["STRINGEX_BENCHMARK_PROJECTS"] = _PROJECTS
+sys.path[:0] = [os.path.join(_DIR, "host"), os.path.join(_DIR, "..")]
+
+import numpy as np
+import pandas as pd
+
+from src import texture_util as tu
+from src.classes import Evidences as EV
+from src.classes import LinkTags as LiT
+from src.classes import NodeTags as NT
+from src.classes import VRNetzElements as VRNE
+from src.uploader import Uploader
+
+NODE_LAYOUTS = ["cy", "3d", "3d2d"]
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def make_network(n_links: int, seed: int = 0) -> dict:
+    """Generates a synthetic STRING like network with one node per ten links.
+
+    Args:
+        n_links (int): number of links.
+        seed (int, optional): seed of the random number generator. Defaults to 0.
+
+    Returns:
+        dict: network with the nodes and links as DataFrames, as they are passed to Uploader.upload_files.
+    """
+    rng = np.random.default_rng(seed)
+    n_nodes = max(100, n_links // 10)
+    nodes = pd.DataFrame(
+        {
+            NT.id: np.arange(n_nodes),
+            NT.name: [f"P{i}" for i in range(n_nodes)],
+            NT.display_name: [f"G{i}" for i in range(n_nodes)],
+        }
+    )
+    for lay in NODE_LAYOUTS:
+        nodes[f"{lay}_pos"] = rng.random((n_nodes, 3)).tolist()
+    nodes[f"{NODE_LAYOUTS[0]}_col"] = rng.integers(0, 256, (n_nodes, 3)).tolist()
+
+    links = pd.DataFrame(
+        {
+            LiT.id: np.arange(n_links),
+            LiT.start: rng.integers(0, n_nodes, n_links),
+            LiT.end: rng.integers(0, n_nodes, n_links),
+        }
+    )
+    for ev, color in EV.get_default_scheme().items():
+        present = rng.random(n_links) < 0.5
+        links[ev] = np.where(present, rng.random(n_links), np.nan)
+        # All links of an evidence share a single color object to keep the set up cheap
+        color = tuple(color)
+        links[f"{ev}_col"] = [color if p else None for p in present]
+    return {
+        VRNE.nodes: nodes,
+        VRNE.links: links,
+        VRNE.node_layouts: NODE_LAYOUTS,
+        VRNE.link_layouts: list(EV.get_default_scheme().keys()),
+    }
+
+
+def written_bytes(location: str, since: int) -> int:
+    """Sums up the size of all files in location which have been modified after since. Hard linked files are counted once."""
+    total = 0
+    seen = set()
+    for root, _, files in os.walk(location):
+        for file in files:
+            stat = os.stat(os.path.join(root, file))
+            if stat.st_mtime_ns >= since and (stat.st_dev, stat.st_ino) not in seen:
+                seen.add((stat.st_dev, stat.st_ino))
+                total += stat.st_size
+    return total
+
+
+def measure(
+    name: str, func, location: str, n_nodes: int, n_links: int, repeat: int, setup=None
+) -> dict:
+    """Runs a stage repeat times and once more with tracemalloc to record its peak memory.
+
+    Args:
+        name (str): name of the stage.
+        func (callable): stage to benchmark.
+        location (str): project folder the stage writes to.
+        n_nodes (int): number of nodes processed by the stage, 0 if the stage does not handle nodes.
+        n_links (int): number of links processed by the stage, 0 if the stage does not handle links.
+        repeat (int): number of timed runs.
+        setup (callable, optional): called before every run, is not timed. Defaults to None.
+
+    Returns:
+        dict: results of the stage.
+    """
+    times = []
+    written = 0
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = timeit.default_timer()
+        since = time.time_ns()
+        func()
+        times.append(timeit.default_timer() - start)
+        written = written_bytes(location, since)
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    best = min(times)
+    res = {
+        "stage": name,
+        "nodes": n_nodes,
+        "links": n_links,
+        "best_s": best,
+        "mean_s": sum(times) / len(times),
+        "nodes_per_s": n_nodes / best if n_nodes else None,
+        "links_per_s": n_links / best if n_links else None,
+        "peak_mb": peak / 2**20,
+        "written_mb": written / 2**20,
+    }
+    print(
+        f"{name:<28} {n_nodes:>8} nodes {n_links:>8} links {best:>9.3f} s "
+        + (f"{res['links_per_s']:>12.0f} links/s " if n_links else " " * 21)
+        + (f"{res['nodes_per_s']:>11.0f} nodes/s " if n_nodes else " " * 20)
+        + f"{res['peak_mb']:>9.1f} MB peak {res['written_mb']:>8.1f} MB written",
+        flush=True,
+    )
+    return res
+
+
+def benchmark(n_links: int, repeat: int, workers: int) -> list[dict]:
+    """Benchmarks all stages of the texture pipeline for a network with n_links links."""
+    network = make_network(n_links)
+    nodes, links = network[VRNE.nodes], network[VRNE.links]
+    n_nodes = len(nodes)
+    name = f"benchmark_{n_links}"
+    uploader = Uploader(network, name, overwrite_project=True, n_workers=workers)
+    uploader.makeProjectFolders()
+    location = uploader.project.location
+
+    def reset():
+        # Forget the hashes of the written textures, otherwise nothing is written again
+        uploader.texture_manifest = {}
+
+    height = tu.node_texture_height(n_nodes)
+    pos = tu.positions_to_array(nodes[f"{NODE_LAYOUTS[1]}_pos"])
+    color = tu.colors_to_array(nodes[f"{NODE_LAYOUTS[0]}_col"])
+    any_col = links[f"{EV.any.value}_col"]
+
+    def threaded(func, *args):
+        def run():
+            with uploader.texture_executor() as executor:
+                func(*args, executor=executor)
+
+        return run
+
+    stages = [
+        (
+            "handle_node_layout",
+            lambda: uploader.handle_node_layout(
+                f"{NODE_LAYOUTS[1]}_pos", pos, color, location, height
+            ),
+            n_nodes,
+            0,
+            reset,
+        ),
+        (
+            "handle_link_layout",
+            lambda: uploader.handle_link_layout(
+                f"{EV.any.value}_col",
+                any_col.iloc[: tu.LINKS_PER_PAGE],
+                location,
+                tu.LINK_TEX_HEIGHT,
+            ),
+            0,
+            min(n_links, tu.LINKS_PER_PAGE),
+            reset,
+        ),
+        (
+            "make_node_tex",
+            lambda: uploader.make_node_tex(nodes, NODE_LAYOUTS),
+            n_nodes,
+            0,
+            reset,
+        ),
+        (
+            "make_node_tex (threads)",
+            threaded(uploader.make_node_tex, nodes, NODE_LAYOUTS),
+            n_nodes,
+            0,
+            reset,
+        ),
+        ("make_link_tex", lambda: uploader.make_link_tex(links, []), 0, n_links, reset),
+        (
+            "make_link_tex (threads)",
+            threaded(uploader.make_link_tex, links, []),
+            0,
+            n_links,
+            reset,
+        ),
+        (
+            "make_link_tex (unchanged)",
+            lambda: uploader.make_link_tex(links, []),
+            0,
+            n_links,
+            None,
+        ),
+    ]
+    results = [
+        measure(stage, func, location, n, m, repeat, setup)
+        for stage, func, n, m, setup in stages
+    ]
+
+    def upload():
+        up = Uploader(
+            make_network(n_links), name, overwrite_project=True, n_workers=workers
+        )
+        up.upload_files(up.network)
+
+    results.append(measure("upload_files", upload, location, n_nodes, n_links, repeat))
+
+    mapped = nodes[[NT.id]].copy()
+    rng = np.random.default_rng(1)
+    mapped[NT.node_color] = rng.integers(0, 256, (n_nodes, 3)).tolist()
+    mapped[NT.size] = np.where(rng.random(n_nodes) < 0.3, rng.random(n_nodes), np.nan)
+    mapping = {VRNE.nodes: mapped, VRNE.links: links[[LiT.id, LiT.start, LiT.end]]}
+
+    def color_nodes():
+        Uploader(mapping, name, n_workers=workers).color_nodes(name)
+
+    results.append(
+        measure("color_nodes", color_nodes, location, n_nodes, n_links, repeat)
+    )
+    shutil.rmtree(location, ignore_errors=True)
+    return results
+
+
+def main(args: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--links",
+        "-l",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="Number of links of the synthetic networks.",
+    )
+    parser.add_argument(
+        "--repeat", "-r", type=int, default=3, help="Number of timed runs per stage."
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=None,
+        help="Number of texture threads. Defaults to settings.TEXTURE_WORKERS.",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        default=None,
+        help="Write the results to this JSON file.",
+    )
+    args = parser.parse_args(args)
+    results = []
+    try:
+        for n_links in args.links:
+            results += benchmark(n_links, args.repeat, args.workers)
+    finally:
+        shutil.rmtree(_PROJECTS, ignore_errors=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
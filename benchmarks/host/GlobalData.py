@@ -0,0 +1,4 @@
+"""Minimal stand-in for the GlobalData module of the VRNetzer."""
+
+sessionData = {}
+pfile = {}
@@ -0,0 +1,131 @@
+"""Minimal stand-in for the project module of the VRNetzer. Only implements what StringEx uses, so the benchmarks can run without the host platform."""
+
+import json
+import os
+import shutil
+
+import numpy as np
+from PIL import Image
+
+PROJECTS_PATH = os.environ.get(
+    "STRINGEX_BENCHMARK_PROJECTS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "projects"),
+)
+NODE, LINK, COLOR, POS = "node", "link", "color", "pos"
+DEFAULT_PFILE = {
+    "name": None,
+    "layouts": [],
+    "layoutsRGB": [],
+    "links": [],
+    "linksRGB": [],
+    "selections": [],
+}
+
+
+class Project:
+    def __init__(self, name: str, read: bool = True) -> None:
+        self.name = name
+        self.location = os.path.join(PROJECTS_PATH, name)
+        self.layouts_dir = os.path.join(self.location, "layouts")
+        self.layoutsl_dir = os.path.join(self.location, "layoutsl")
+        self.layouts_rgb_dir = os.path.join(self.location, "layoutsRGB")
+        self.links_dir = os.path.join(self.location, "links")
+        self.links_rgb_dir = os.path.join(self.location, "linksRGB")
+        self.pfile = self.names = self.nodes = self.links = None
+        if read and self.exists():
+            self.read_all_jsons()
+
+    def exists(self) -> bool:
+        return os.path.isdir(self.location)
+
+    def remove(self) -> None:
+        shutil.rmtree(self.location, ignore_errors=True)
+
+    def create_all_directories(self) -> None:
+        for directory in [
+            self.layouts_dir,
+            self.layoutsl_dir,
+            self.layouts_rgb_dir,
+            self.links_dir,
+            self.links_rgb_dir,
+        ]:
+            os.makedirs(directory, exist_ok=True)
+
+    def _read(self, name: str) -> dict:
+        file = os.path.join(self.location, f"{name}.json")
+        if not os.path.exists(file):
+            return None
+        with open(file, "r") as f:
+            return json.load(f)
+
+    def _write(self, name: str, data: dict) -> None:
+        with open(os.path.join(self.location, f"{name}.json"), "w") as f:
+            json.dump(data, f)
+
+    def read_pfile(self) -> None:
+        self.pfile = self._read("pfile")
+
+    def read_names(self) -> None:
+        self.names = self._read("names")
+
+    def read_nodes(self) -> None:
+        self.nodes = self._read("nodes")
+
+    def read_links(self) -> None:
+        self.links = self._read("links")
+
+    def read_all_jsons(self) -> None:
+        self.read_pfile()
+        self.read_names()
+        self.read_nodes()
+        self.read_links()
+
+    def write_pfile(self) -> None:
+        self._write("pfile", self.pfile)
+
+    def write_names(self) -> None:
+        self._write("names", self.names)
+
+    def write_nodes(self) -> None:
+        self._write("nodes", self.nodes)
+
+    def write_links(self) -> None:
+        self._write("links", self.links)
+
+    def write_all_jsons(self) -> None:
+        self.write_pfile()
+        self.write_names()
+        self.write_nodes()
+        self.write_links()
+
+    def get_nodes(self) -> dict:
+        return self.nodes
+
+    def get_pfile_value(self, key: str):
+        return self.pfile.get(key)
+
+    def set_pfile_value(self, key: str, value) -> None:
+        self.pfile[key] = value
+        self.write_pfile()
+
+    def _bitmap_file(self, name: str, kind: str, tex: str) -> str:
+        if kind == NODE:
+            if tex == COLOR:
+                return os.path.join(self.layouts_rgb_dir, f"{name}.png")
+            return os.path.join(self.layouts_dir, f"{name}.bmp")
+        if tex == COLOR:
+            return os.path.join(self.links_rgb_dir, f"{name}.png")
+        return os.path.join(self.links_dir, f"{name}.bmp")
+
+    def load_bitmap(self, name: str, kind: str, tex: str, numpy: bool = False):
+        image = Image.open(self._bitmap_file(name, kind, tex))
+        if numpy:
+            return np.array(image)
+        return image
+
+    def write_bitmap(self, bitmap: Image.Image, name: str, kind: str, tex: str) -> None:
+        bitmap.save(self._bitmap_file(name, kind, tex))
+
+    def add_node_color(self, name: str) -> None:
+        if name not in self.pfile["layoutsRGB"]:
+            self.pfile["layoutsRGB"].append(name)
@@ -0,0 +1,11 @@
+"""Minimal stand-in for the uploader module of the VRNetzer."""
+
+import os
+
+from project import PROJECTS_PATH
+
+
+def listProjects() -> list[str]:
+    if not os.path.isdir(PROJECTS_PATH):
+        return []
+    return sorted(os.listdir(PROJECTS_PATH))
@@ -124,6 +124,9 @@ def workflow(parser):
                 "opt_dist": parser.opt_dist,
                 "iterations": parser.iterations,
                 "threshold": parser.spring_threshold,
+                "per_component": parser.per_component,
+                "spectral_init": parser.spectral_init,
+                "time_budget_s": parser.time_budget,
             }
 
             def layout():
@@ -146,6 +149,7 @@ def workflow(parser):
                     parser.functional_threshold,
                     parser.no_lay,
                     parser.preview_layout,
+                    parser.layout_workers,
                 )
 
             if parser.benchmark:
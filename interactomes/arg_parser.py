@@ -141,6 +141,13 @@ def parse_args(args=None):
         help="Defines the number of processes to for layout calculations and upload",
         default=os.cpu_count() - 1,
     )
+    parser.add_argument(
+        "--layout_workers",
+        "-lw",
+        type=int,
+        help="Defines the number of processes in which the layouts and the connected components of a layout are calculated.",
+        default=os.cpu_count(),
+    )
     parser.add_argument(
         "--parallel",
         "-par",
@@ -247,21 +254,42 @@ def parse_args(args=None):
         "--opt_dist",
         "-opd",
         type=float,
-        help="Defines the optimal distance parameter k of NetworkX's spring algorithm.",
+        help="Defines the optimal distance parameter k of NetworkX's spring algorithm and the barnes_hut and multilevel algorithms.",
         default=0,
     )
     parser.add_argument(
         "--iterations",
         "-it",
         type=int,
-        help="Defines the number of iterations parameter of NetworkX's spring algorithm.",
+        help="Defines the number of iterations parameter of NetworkX's spring algorithm and the barnes_hut and multilevel algorithms.",
         default=50,
     )
+    parser.add_argument(
+        "--per_component",
+        "-pc",
+        action="store_true",
+        default=False,
+        help="Lays out every connected component separately in a process pool and packs the components by size.",
+    )
+    parser.add_argument(
+        "--spectral_init",
+        "-si",
+        action="store_true",
+        default=False,
+        help="Starts the link based algorithms from the spectral layout instead of random positions.",
+    )
+    parser.add_argument(
+        "--time_budget",
+        "-tb",
+        type=float,
+        default=None,
+        help="Maximal time in seconds per call of the layouter. Iterative algorithms stop at the budget, the others are replaced by faster ones.",
+    )
     parser.add_argument(
         "--spring_threshold",
         "-spth",
         type=float,
-        help="Defines the threshold parameter of NetworkX's spring algorithm.",
+        help="Defines the threshold parameter of NetworkX's spring algorithm and the barnes_hut and multilevel algorithms.",
         default=0.0001,
     )
     # Benchmark
@@ -297,8 +325,8 @@ def parse_args(args=None):
         "--max_links",
         "-ml",
         type=int,
-        help="Filter out every links that is more than this based on experimental score and combined score.",
-        default=st.MAX_NUM_LINKS,
+        help="Filter out every links that is more than this based on experimental score and combined score. By default all links are kept.",
+        default=st.LINK_BUDGET,
     )
     parser.add_argument(
         "--no_lay",
@@ -2,7 +2,6 @@ from interactomes import data_io
 from interactomes import functional_annotations as fa
 from src.classes import NodeTags as NT
 import os
-import matplotlib.pyplot as plt
 import pandas as pd
 import timeit
 from datetime import timedelta
@@ -11,6 +10,8 @@ from interactomes import data_io
 
 def plot_feature_distribution(_dir: str, organism: str, threshold: float = 0.0):
     """Plot the distribution of feature counts for each feature matrix."""
+    import matplotlib.pyplot as plt
+
     feature_matrices = {}
     for fm in os.listdir(os.path.join(_dir, organism, "functional_annotations", "fm")):
         if fm.endswith(".pickle"):
@@ -9,10 +9,12 @@ from interactomes import data_io
 from interactomes import functional_annotations as fa
 from src import map_uniprot
 from src.classes import Evidences
+from src.classes import LayoutAlgorithms as LA
 from src.classes import LinkTags as LiT
 from src.classes import NodeTags as NT
 from src.classes import Organisms
 from src.classes import StringTags as ST
+from src.feature_knn import KNN_NEIGHBORS
 from src.layouter import Layouter
 
 
@@ -22,7 +24,7 @@ def construct_graph(
     clean_name: str,
     tax_id: int,
     last_link: int or None = None,
-    MAX_NUM_LINKS=st.MAX_NUM_LINKS,
+    MAX_NUM_LINKS=st.LINK_BUDGET,
     overwrite=False,
 ) -> tuple[nx.Graph, dict]:
     """Extracts data from the STRING DB network files and constructs a nx.Graph afterwards.
@@ -84,6 +86,8 @@ def gen_graph(
     Returns:
         tuple[pd.DataFrame, pd.DataFrame]: Nodes and link data frames.
     """
+    import swifter
+
     organism_dir = os.path.join(_dir, clean_name)
     species = Organisms.get_scientific_name(organism)
     taxid = Organisms.get_tax_ids(organism)
@@ -233,12 +237,13 @@ def construct_layouts(
     overwrite_links: bool = False,
     threshold: float = 0.4,
     eps: float = None,
-    max_links: int = st.MAX_NUM_LINKS,
+    max_links: int = st.LINK_BUDGET,
     layout_name: list[str] = None,
     max_num_features: int = None,
     functional_threshold: float = 0.1,
     no_layout: bool = False,
     preview_layout: bool = False,
+    n_workers: int = None,
 ) -> None:
     """Constructs the layouts for the network and compress them into a tar file.
 
@@ -247,6 +252,7 @@ def construct_layouts(
         _dir (str): Path to the directory in which all files are saved in.
         layout_algo (str): Defines the layout algorithm which should be used.
         variables (dict): Defines the variables of the respective layout algorithm.
+        n_workers (int): Number of processes in which the layouts are calculated. Defaults to None, in which case settings.LAYOUT_WORKERS is used.
     """
     functional_lay = False
     for layout in layout_algo:
@@ -265,7 +271,8 @@ def construct_layouts(
     #         )[:max_num_features]
     #     )
 
-    all_links = all_links[:max_links]
+    if max_links is not None:
+        all_links = all_links[:max_links]
 
     G = nx.from_pandas_edgelist(
         all_links[all_links[Evidences.any.value] > threshold],
@@ -347,11 +354,32 @@ def construct_layouts(
     layouter = Layouter()
     layouter.graph = layout_graph
     matrix_list = [feature_matrices[name] for name in layout_name]
+    knn_list = None
+    if any(
+        f"{LA.cartoGRAPH_functional}_{LA.cartoGRAPH_umap}" in algo
+        for algo in layout_algo
+    ):
+        # Computed once per category and cached, parameter sweeps of UMAP reuse them
+        knn_graphs = fa.get_knn_graphs(
+            _dir,
+            clean_name,
+            {name: feature_matrices[name] for name in layout_name},
+            (variables or {}).get("n_neighbors") or KNN_NEIGHBORS,
+        )
+        knn_list = [knn_graphs.get(name) for name in layout_name]
     layouts = layouter.apply_layout(
-        layout_algo, variables, matrix_list, random_lay=random_lay
+        layout_algo,
+        variables,
+        matrix_list,
+        random_lay=random_lay,
+        n_workers=n_workers,
+        knn_graphs=knn_list,
     )
 
     st.log.info(f"Generated layouts. Used algorithms: {layout_algo}.")
+    st.log.info(
+        f"Layout cache: {layouter.cache_hits} hit(s), {layouter.cache_misses} miss(es)."
+    )
     data_io.write_link_layouts(clean_name, all_links, _dir, overwrite_links)
     data_io.write_node_layout(
         clean_name,
@@ -5,7 +5,6 @@ import time
 import networkx as nx
 import numpy as np
 import pandas as pd
-from goatools import obo_parser
 
 import src.settings as st
 from interactomes import util
@@ -14,6 +13,7 @@ from src.classes import LinkTags as LiT
 from src.classes import NodeTags as NT
 from src.classes import Organisms
 from src.classes import StringTags as ST
+from src.feature_knn import KNNGraph
 from src.layouter import take_screenshot, visualize_layout
 
 
@@ -37,7 +37,7 @@ def write_node_layout(
     Args:
         organism_dir (str): organism_dir from which the network originates from.
         G (nx.Graph): Graph of the network.
-        layout (dict): calculated layout of the graph. With the node id as key and the position as value.
+        layouts (dict[int, LayoutResult]): calculated layouts of the graph, see Layouter.apply_layout.
     """
     _directory = os.path.join(_dir, organism_dir)
     tax_id = Organisms.get_tax_ids(directory=organism_dir)
@@ -54,7 +54,7 @@ def write_node_layout(
         axis=1,
     )
     for idx, layout in layouts.items():
-        pos = np.array(list(layout.values()))
+        pos = layout.positions(nodes.index)
         name = layout_name[idx]
         algo = algos[idx]
         category = None
@@ -344,6 +344,8 @@ def read_raw_data(
 
 def read_go_annotation(annot_file, ont_file):
     """Reads the annotation file and returns a dictionary with the annotations."""
+    from goatools import obo_parser
+
     annot = pd.read_table(
         annot_file, comment="!", header=None, sep="\t", low_memory=False
     )
@@ -445,8 +447,10 @@ def read_links(directory, tax_id, MAX_NUM_LINKS):
     link_table = link_table.astype(type_dict)
 
     n = len(link_table)
-    if n > MAX_NUM_LINKS:
-        st.log.debug(f"Too many links. Will filter them.", flush=True)
+    if MAX_NUM_LINKS is not None and n > MAX_NUM_LINKS:
+        st.log.warning(
+            f"Network has {n} links, keeping the best {MAX_NUM_LINKS}.", flush=True
+        )
         link_table = link_table.sort_values(
             [Evidences.stringdb_experiments.value, Evidences.any.value], ascending=False
         )
@@ -579,5 +583,22 @@ def read_feature_matrices(
     return feature_matrices
 
 
+def write_knn_graph(_dir: str, organism: str, category: str, knn: KNNGraph) -> None:
+    """Writes the kNN graph of a feature matrix to functional_annotations/knn."""
+    path = os.path.join(_dir, organism, "functional_annotations", "knn")
+    os.makedirs(path, exist_ok=True)
+    knn.save(os.path.join(path, f"{category}.npz"))
+
+
+def read_knn_graph(_dir: str, organism: str, category: str) -> KNNGraph or None:
+    """Reads the kNN graph of a feature matrix, returns None if it has not been written yet."""
+    file_path = os.path.join(
+        _dir, organism, "functional_annotations", "knn", f"{category}.npz"
+    )
+    if not os.path.isfile(file_path):
+        return None
+    return KNNGraph.load(file_path)
+
+
 if __name__ == "__main__":
     pass
@@ -3,6 +3,7 @@ import os
 import pandas as pd
 
 from interactomes import data_io
+from src import feature_knn
 from src.classes import Organisms
 from src.settings import log
 
@@ -169,6 +170,43 @@ def get_feature_matrices(
     return fms
 
 
+def get_knn_graphs(
+    _dir: str,
+    clean_name: str,
+    feature_matrices: dict[str, pd.DataFrame],
+    n_neighbors: int = feature_knn.KNN_NEIGHBORS,
+) -> dict[str, feature_knn.KNNGraph]:
+    """Reads the Jaccard kNN graphs of the feature matrices from functional_annotations/knn. A graph is computed and written again, if it does not exist, if the feature matrix changed or if it has less than n_neighbors neighbors.
+
+    Args:
+        _dir (str): Path to the directory in which all files are saved in.
+        clean_name (str): Organism which should be processed.
+        feature_matrices (dict[str, pd.DataFrame]): feature matrices with their category as key.
+        n_neighbors (int, optional): minimal number of neighbors. Defaults to feature_knn.KNN_NEIGHBORS.
+
+    Returns:
+        dict[str, feature_knn.KNNGraph]: kNN graphs with the category as key.
+    """
+    knn_graphs = {}
+    for category, feature_matrix in feature_matrices.items():
+        if feature_matrix is None:
+            continue
+        features = feature_knn.functional_features(feature_matrix)
+        knn = data_io.read_knn_graph(_dir, clean_name, category)
+        if (
+            knn is None
+            or knn.n_neighbors < min(n_neighbors, len(features))
+            or not knn.matches(features)
+        ):
+            log.debug(f"Computing the kNN graph of {category}...")
+            knn = feature_knn.jaccard_knn(
+                features, max(n_neighbors, feature_knn.KNN_NEIGHBORS)
+            )
+            data_io.write_knn_graph(_dir, clean_name, category, knn)
+        knn_graphs[category] = knn
+    return knn_graphs
+
+
 def construct_feature_matrices(
     name,
     functional_annotations,
@@ -176,6 +214,8 @@ def construct_feature_matrices(
     functional_categories=FUNCTIONAL_CATEGORIES,
     min_threshold=0.01,
 ):
+    import swifter
+
     feature_matrices = {}
     filtered_functional_annotations = {}
     for cat in functional_annotations:
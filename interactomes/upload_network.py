@@ -29,6 +29,8 @@ def upload(
         port (int): Port of the VRNetzer.
         src (str): path directory, where the csv files are located.
     """
+    import swifter
+
     layouts = []
     link_layouts = []
     src_dir = os.path.join(src, directory)
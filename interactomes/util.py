@@ -4,7 +4,6 @@ import time
 import networkx as nx
 import numpy as np
 import pandas as pd
-import seaborn as sns
 
 import src.settings as st
 from interactomes import check_feature_matrices, data_io
@@ -80,6 +79,7 @@ def color_layout(
 
 def clustering(to_color, fm, pos, eps=None, min_cs=None, max_cs=None, min_samples=None):
     import hdbscan
+    import seaborn as sns
     import umap
     from matplotlib import pyplot as plt
     from sklearn.decomposition import PCA
@@ -160,6 +160,8 @@ def model_varaibles(fm, pos, min_cs, eps):
 
 
 def feature_coloring(to_color, feature_matrix, category):
+    import swifter
+
     used_colors = set()
     for idx, term in enumerate(category.index):
         # check if any coloring necessary
@@ -250,7 +252,20 @@ def recolor(
         # print(nodes)
         feature_matrix, category = None, None
         min_cs, max_cs, min_samples, consider = None, None, None, None
-        if not any([name in layout_name for name in ["spring", "local", "global"]]):
+        if not any(
+            [
+                name in layout_name
+                for name in [
+                    "spring",
+                    "barnes_hut",
+                    "multilevel",
+                    "stress",
+                    "spectral",
+                    "local",
+                    "global",
+                ]
+            ]
+        ):
             if layout_name not in feature_matrices:
                 st.log.debug(f"Layout {layout_name} not in feature matrices.")
                 continue
@@ -1,10 +1,6 @@
-try:
-    from pip._internal.operations import freeze
-except ImportError:  # pip < 10.0
-    from pip.operations import freeze
-
 import sys
 from enum import Enum
+from importlib.util import find_spec
 
 
 # Tags
@@ -83,6 +79,7 @@ class ProjectTag:
     layouts_rgb = "layoutsRGB"
     links = "links"
     links_rgb = "linksRGB"
+    link_pages = "linkPages"
 
 
 class LinkTags:
@@ -118,7 +115,11 @@ class LayoutAlgorithms:
 
     spring = "spring"
     kamada_kawai = "kamada_kawai"
-    all_algos = [spring, kamada_kawai]
+    barnes_hut = "barnes_hut"
+    multilevel = "multilevel"
+    stress = "stress"
+    spectral = "spectral"
+    all_algos = [spring, kamada_kawai, barnes_hut, multilevel, stress, spectral]
     random = "random"
     cartoGRAPH = "cg"
     cartoGRAPH_local = "local"
@@ -128,7 +129,8 @@ class LayoutAlgorithms:
     cartoGRAPH_umap = "umap"
     cartoGRAPH_functional = "functional"
 
-    if "cartoGRAPHs" in [module.split("=")[0] for module in list(freeze.freeze())]:
+    # Only check whether cartoGRAPHs is installed, importing it is slow
+    if find_spec("cartoGRAPHs") is not None:
         all_algos += [
             f"{cartoGRAPH}_{cartoGRAPH_local}_{cartoGRAPH_tsne}",
             f"{cartoGRAPH}_{cartoGRAPH_local}_{cartoGRAPH_umap}",
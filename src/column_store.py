@@ -0,0 +1,157 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from .settings import log
+
+COLUMN_STORE_DIR = "columns"
+NUMERIC = "numeric"
+STRING = "string"
+JSON_ONLY = "json"
+
+
+def _table_dir(location: str, table: str) -> str:
+    return os.path.join(location, COLUMN_STORE_DIR, table)
+
+
+def _json_stamp(file: str) -> list[int]:
+    """Size and modification time of the JSON file the column store mirrors."""
+    stat = os.stat(file)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _column_kind(series: pd.Series) -> str:
+    """Decides how a column is stored. Numeric and boolean columns are stored as arrays, columns which only contain strings as string table. Everything else (e.g. lists) is only available in the JSON file."""
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in "biuf":
+        return NUMERIC
+    values = series.dropna()
+    if values.map(lambda x: isinstance(x, str)).all():
+        return STRING
+    return JSON_ONLY
+
+
+def write_table(location: str, table: str, df: pd.DataFrame, json_file: str) -> None:
+    """Writes a columnar copy of the nodes or links of a project next to its JSON file. Numeric columns are written as .npy arrays and string columns as a string table consisting of the utf-8 encoded bytes and the offsets of each string. The copy is bound to the current state of json_file, if the JSON file changes afterwards, the column store is ignored by the readers.
+
+    Args:
+        location (str): path to the project folder.
+        table (str): name of the table, i.e. "nodes" or "links".
+        df (pd.DataFrame): data of the table.
+        json_file (str): JSON file which contains the same data.
+    """
+    directory = _table_dir(location, table)
+    if os.path.exists(directory):
+        shutil.rmtree(directory)
+    os.makedirs(directory)
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if len(series) > 0 and series.isna().all():
+            # Missing values are not written to the JSON file either
+            continue
+        kind = _column_kind(series)
+        file = os.path.join(directory, f"c{len(columns)}")
+        columns[col] = kind
+        if kind == NUMERIC:
+            np.save(f"{file}.npy", series.to_numpy())
+        elif kind == STRING:
+            missing = series.isna().to_numpy()
+            encoded = [b"" if m else v.encode() for v, m in zip(series, missing)]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(v) for v in encoded], out=offsets[1:])
+            np.save(f"{file}.str.npy", np.frombuffer(b"".join(encoded), dtype=np.uint8))
+            np.save(f"{file}.off.npy", offsets)
+            if missing.any():
+                np.save(f"{file}.na.npy", missing)
+    meta = {
+        "rows": len(df),
+        "columns": columns,
+        "json": _json_stamp(json_file),
+    }
+    with open(os.path.join(directory, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+
+def remove_table(location: str, table: str) -> None:
+    """Removes the column store of a table, e.g. after its JSON file has been written without it.
+
+    Args:
+        location (str): path to the project folder.
+        table (str): name of the table, i.e. "nodes" or "links".
+    """
+    directory = _table_dir(location, table)
+    if os.path.exists(directory):
+        shutil.rmtree(directory)
+
+
+def _read_meta(location: str, table: str) -> dict:
+    """Reads the meta data of a table. Returns None if there is no column store or if it is outdated."""
+    file = os.path.join(_table_dir(location, table), "meta.json")
+    json_file = os.path.join(location, f"{table}.json")
+    if not os.path.exists(file) or not os.path.exists(json_file):
+        return None
+    with open(file, "r") as f:
+        meta = json.load(f)
+    if meta["json"] != _json_stamp(json_file):
+        log.debug(f"Column store of {table} is outdated, falling back to JSON.")
+        return None
+    return meta
+
+
+def _read_column(directory: str, idx: int, kind: str) -> np.ndarray or list:
+    file = os.path.join(directory, f"c{idx}")
+    if kind == NUMERIC:
+        return np.load(f"{file}.npy", mmap_mode="r")
+    data = np.load(f"{file}.str.npy", mmap_mode="r").tobytes()
+    offsets = np.load(f"{file}.off.npy").tolist()
+    values = [data[a:b].decode() for a, b in zip(offsets[:-1], offsets[1:])]
+    if os.path.exists(f"{file}.na.npy"):
+        missing = np.load(f"{file}.na.npy")
+        values = [None if m else v for v, m in zip(values, missing)]
+    return values
+
+
+def read_column(location: str, table: str, column: str) -> np.ndarray or list:
+    """Reads a single column of a table from the column store. Numeric columns are memory mapped.
+
+    Args:
+        location (str): path to the project folder.
+        table (str): name of the table, i.e. "nodes" or "links".
+        column (str): name of the column.
+
+    Returns:
+        np.ndarray or list: values of the column. None if the column is not available in the column store.
+    """
+    meta = _read_meta(location, table)
+    if meta is None or meta["columns"].get(column) not in (NUMERIC, STRING):
+        return None
+    idx = list(meta["columns"]).index(column)
+    return _read_column(_table_dir(location, table), idx, meta["columns"][column])
+
+
+def read_table(location: str, table: str, skip: list[str] = []) -> pd.DataFrame:
+    """Reads a table from the column store.
+
+    Args:
+        location (str): path to the project folder.
+        table (str): name of the table, i.e. "nodes" or "links".
+        skip (list[str], optional): columns which are not needed. Defaults to [].
+
+    Returns:
+        pd.DataFrame: the table. None if there is no up to date column store or if a needed column is only available in the JSON file.
+    """
+    meta = _read_meta(location, table)
+    if meta is None:
+        return None
+    directory = _table_dir(location, table)
+    data = {}
+    for idx, (col, kind) in enumerate(meta["columns"].items()):
+        if col in skip:
+            continue
+        if kind == JSON_ONLY:
+            return None
+        data[col] = _read_column(directory, idx, kind)
+    return pd.DataFrame(data, index=pd.RangeIndex(meta["rows"]))
@@ -0,0 +1,218 @@
+"""Sparse Jaccard k-nearest-neighbor graphs of the functional feature matrices.
+
+UMAP only needs the k nearest neighbors of every node, but when it is handed the feature matrix it computes them again for every layout. The neighbors are computed here once with sparse matrix products in blocks of rows, so the memory stays O(block·n), and can be stored next to the feature matrices and handed to UMAP as precomputed_knn. The same is done for the dense topology features of topology_layout under the cosine distance.
+"""
+
+import hashlib
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+BLOCK_ENTRIES = 2**23  # Maximal number of dense distances computed at once
+KNN_NEIGHBORS = 30  # Neighbors stored per node, covers the usual UMAP n_neighbors
+
+
+def feature_fingerprint(features: pd.DataFrame) -> str:
+    """Hashes the node ids, the feature names and the entries of a feature matrix.
+
+    Args:
+        features (pd.DataFrame): feature matrix with node ids as index.
+
+    Returns:
+        str: hex digest of the feature matrix.
+    """
+    h = hashlib.sha1()
+    h.update(np.asarray(features.index, dtype=np.int64).tobytes())
+    h.update("\0".join(map(str, features.columns)).encode())
+    h.update(np.ascontiguousarray(features.to_numpy(dtype=bool)).tobytes())
+    return h.hexdigest()
+
+
+class KNNGraph:
+    """k-nearest-neighbor graph of the rows of a feature matrix. indices and distances have shape (n, k), the neighbors of every row are sorted by distance and include the row itself."""
+
+    __slots__ = ("ids", "indices", "distances", "fingerprint")
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        indices: np.ndarray,
+        distances: np.ndarray,
+        fingerprint: str = "",
+    ):
+        self.ids = np.asarray(ids)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.distances = np.asarray(distances, dtype=np.float32)
+        self.fingerprint = str(fingerprint)
+
+    @property
+    def n_neighbors(self) -> int:
+        return self.indices.shape[1]
+
+    def truncated(self, k: int) -> "KNNGraph":
+        """Returns the graph with the k nearest neighbors of every row."""
+        return KNNGraph(
+            self.ids, self.indices[:, :k], self.distances[:, :k], self.fingerprint
+        )
+
+    def matches(self, features: pd.DataFrame) -> bool:
+        """Checks if the graph was computed from the given feature matrix."""
+        return self.fingerprint == feature_fingerprint(features)
+
+    def save(self, path: str) -> None:
+        """Writes the graph to a .npz file."""
+        np.savez(
+            path,
+            ids=self.ids,
+            indices=self.indices,
+            distances=self.distances,
+            fingerprint=np.array(self.fingerprint),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "KNNGraph":
+        """Reads a graph written by save."""
+        with np.load(path) as data:
+            return cls(
+                data["ids"],
+                data["indices"],
+                data["distances"],
+                data["fingerprint"].item(),
+            )
+
+
+def functional_features(feature_matrix: pd.DataFrame) -> pd.DataFrame:
+    """Selects the part of a feature matrix on which a functional layout is computed: the nodes with at least one entry, without the "annotations" count column added by interactomes.data_io.write_feature_matrices.
+
+    Args:
+        feature_matrix (pd.DataFrame): feature matrix with node ids as index.
+
+    Returns:
+        pd.DataFrame: the selected feature matrix.
+    """
+    feature_matrix = feature_matrix[feature_matrix.any(axis=1)]
+    return feature_matrix.drop(columns="annotations", errors="ignore")
+
+
+def block_knn(
+    n: int, k: int, block_distances: Callable[[int, int], np.ndarray]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Selects the k nearest neighbors of n rows, while the distances are only computed for a block of rows at a time.
+
+    Args:
+        n (int): number of rows.
+        k (int): number of neighbors, including the row itself.
+        block_distances (Callable[[int, int], np.ndarray]): returns the dense distances of the rows start to end to all rows.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: indices and distances of the neighbors with shape (n, k), sorted by distance.
+    """
+    indices = np.zeros((n, k), dtype=np.int32)
+    distances = np.zeros((n, k), dtype=np.float32)
+    block = max(1, BLOCK_ENTRIES // max(n, 1))
+    for start in range(0, n, block):
+        end = min(start + block, n)
+        dist = block_distances(start, end)
+        rows = np.arange(end - start)
+        dist[rows, rows + start] = -1  # Every row is its own nearest neighbor
+        nearest = np.argpartition(dist, k - 1, axis=1)[:, :k]
+        nearest_dist = np.take_along_axis(dist, nearest, axis=1)
+        order = np.argsort(nearest_dist, axis=1, kind="stable")
+        indices[start:end] = np.take_along_axis(nearest, order, axis=1)
+        distances[start:end] = np.maximum(
+            np.take_along_axis(nearest_dist, order, axis=1), 0
+        )
+    return indices, distances
+
+
+def jaccard_knn(features: pd.DataFrame, k: int) -> KNNGraph:
+    """Computes the k nearest neighbors of every row of a boolean feature matrix under the Jaccard distance. The intersections are computed with a sparse matrix product for a block of rows at a time. Rows without a feature have distance 1 to all other rows.
+
+    Args:
+        features (pd.DataFrame): boolean feature matrix with node ids as index and features as columns.
+        k (int): number of neighbors, including the row itself.
+
+    Returns:
+        KNNGraph: the neighbors of every row.
+    """
+    n = len(features)
+    X = sp.csr_matrix(features.to_numpy(dtype=np.float32))
+    XT = X.T.tocsc()
+    size = np.asarray(X.sum(axis=1)).ravel()
+
+    def block_distances(start: int, end: int) -> np.ndarray:
+        intersection = (X[start:end] @ XT).toarray()
+        union = size[start:end, None] + size[None, :] - intersection
+        return 1 - np.divide(
+            intersection, union, out=np.zeros_like(intersection), where=union > 0
+        )
+
+    indices, distances = block_knn(n, max(1, min(k, n)), block_distances)
+    return KNNGraph(
+        np.asarray(features.index),
+        indices,
+        distances,
+        feature_fingerprint(features),
+    )
+
+
+def cosine_knn(ids: np.ndarray, features: np.ndarray, k: int) -> KNNGraph:
+    """Computes the k nearest neighbors of every row of a dense feature matrix under the cosine distance, a block of rows at a time.
+
+    Args:
+        ids (np.ndarray): node ids of the rows.
+        features (np.ndarray): feature matrix with shape (n, d).
+        k (int): number of neighbors, including the row itself.
+
+    Returns:
+        KNNGraph: the neighbors of every row.
+    """
+    n = len(features)
+    features = np.asarray(features, dtype=np.float32)
+    norm = np.linalg.norm(features, axis=1, keepdims=True)
+    X = np.divide(features, norm, out=np.zeros_like(features), where=norm > 0)
+
+    def block_distances(start: int, end: int) -> np.ndarray:
+        return 1 - X[start:end] @ X.T
+
+    indices, distances = block_knn(n, max(1, min(k, n)), block_distances)
+    return KNNGraph(ids, indices, distances)
+
+
+def umap_embedding(
+    features: np.ndarray,
+    knn_graph: KNNGraph,
+    dim: int = 3,
+    n_neighbors: int = 10,
+    spread: float = 1.0,
+    min_dist: float = 0.1,
+    metric: str = "jaccard",
+) -> np.ndarray:
+    """Embeds the rows of a feature matrix with UMAP, using a precomputed kNN graph instead of computing the distances between the rows again. UMAP is installed together with cartoGRAPHs.
+
+    Args:
+        features (np.ndarray): feature matrix from which the kNN graph was computed.
+        knn_graph (KNNGraph): kNN graph of the feature matrix, only its first n_neighbors neighbors are used.
+        dim (int, optional): dimension of the embedding. Defaults to 3.
+        n_neighbors (int, optional): size of the local neighborhood. Defaults to 10.
+        spread (float, optional): scale of the embedded points. Defaults to 1.0.
+        min_dist (float, optional): minimal distance between the embedded points. Defaults to 0.1.
+        metric (str, optional): metric of the kNN graph. Defaults to "jaccard".
+
+    Returns:
+        np.ndarray: embedding with shape (n, dim).
+    """
+    import umap
+
+    n_neighbors = min(n_neighbors, len(features), knn_graph.n_neighbors)
+    knn = knn_graph.truncated(n_neighbors)
+    return umap.UMAP(
+        n_neighbors=n_neighbors,
+        n_components=dim,
+        spread=spread,
+        min_dist=min_dist,
+        metric=metric,
+        precomputed_knn=(knn.indices, knn.distances, None),
+    ).fit_transform(features)
@@ -0,0 +1,501 @@
+"""Force directed 3D layout for large graphs.
+
+The forces follow the Fruchterman-Reingold model used by networkx.spring_layout. The attractive forces are evaluated on the sparse edge list, the repulsive forces are approximated with a Barnes-Hut octree. The octree is built from the Morton codes of the node positions and pairs of its cells are traversed level by level, so that every step is a vectorized NumPy operation on all pairs at once.
+"""
+
+import time
+
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+
+MAX_DEPTH = 16  # Maximal depth of the octree
+MIN_DIST = 0.01  # Distances are clipped to this value, as in networkx
+
+
+def adjacency(G: nx.Graph) -> tuple[list, np.ndarray, np.ndarray, np.ndarray]:
+    """Extracts the edge list of a graph. Every edge is contained once, self loops are dropped.
+
+    Args:
+        G (nx.Graph): Graph to extract the edges from. The "weight" attribute of an edge is used as its weight, it defaults to 1.
+
+    Returns:
+        tuple[list, np.ndarray, np.ndarray, np.ndarray]: node list, start indices, end indices and weights of the edges.
+    """
+    nodes = list(G.nodes())
+    A = sp.triu(nx.to_scipy_sparse_array(G, nodelist=nodes, format="coo"), k=1)
+    A = A.tocoo()
+    return nodes, A.row, A.col, A.data.astype(float)
+
+
+def _spread_bits(x: np.ndarray) -> np.ndarray:
+    """Inserts two zero bits between each of the lower 21 bits of x."""
+    x = x.astype(np.uint64) & np.uint64(0x1FFFFF)
+    for shift, mask in (
+        (32, 0x1F00000000FFFF),
+        (16, 0x1F0000FF0000FF),
+        (8, 0x100F00F00F00F00F),
+        (4, 0x10C30C30C30C30C3),
+        (2, 0x1249249249249249),
+    ):
+        x = (x | (x << np.uint64(shift))) & np.uint64(mask)
+    return x
+
+
+def _expand(counts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """For every entry i of counts, repeats i counts[i] times and enumerates the repetitions.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: index of the entry and number of the repetition.
+    """
+    idx = np.repeat(np.arange(len(counts)), counts)
+    first = np.cumsum(counts) - counts
+    return idx, np.arange(len(idx)) - first[idx]
+
+
+def _scatter(
+    a: np.ndarray,
+    b: np.ndarray,
+    weight_a: np.ndarray,
+    weight_b: np.ndarray,
+    values: np.ndarray,
+    n: int,
+) -> np.ndarray:
+    """Adds the rows of values, scaled by weight_a, to the rows a and, scaled by weight_b, to the rows b of an (n, columns) array.
+
+    Returns:
+        np.ndarray: the summed rows.
+    """
+    m = len(values)
+    scatter = sp.csr_matrix(
+        (
+            np.concatenate([weight_a, weight_b]).astype(float),
+            (np.concatenate([a, b]), np.tile(np.arange(m), 2)),
+        ),
+        shape=(n, m),
+    )
+    return scatter @ values
+
+
+class _Octree:
+    """Octree of a set of points, stored level by level. The points are sorted by their Morton code, such that every cell covers a contiguous range of points."""
+
+    def __init__(self, pos: np.ndarray, depth: int = None):
+        if depth is None:
+            # Deep enough to separate most points, deeper leaves are evaluated point by point
+            depth = min(MAX_DEPTH, int(np.log(len(pos)) / np.log(8)) + 6)
+        lo = pos.min(axis=0)
+        size = max((pos.max(axis=0) - lo).max(), 1e-12)
+        q = np.minimum(((pos - lo) / size * 2**depth).astype(np.int64), 2**depth - 1)
+        codes = (
+            (_spread_bits(q[:, 0]) << np.uint64(2))
+            | (_spread_bits(q[:, 1]) << np.uint64(1))
+            | _spread_bits(q[:, 2])
+        )
+        self.order = np.argsort(codes, kind="stable")
+        codes = codes[self.order]
+        self.pos = pos[self.order]
+        self.depth = depth
+
+        # Per level: width, first point, number of points, center of mass and the cell of every point
+        self.width, self.start, self.count, self.com, self.cell = [], [], [], [], []
+        keys = []
+        for level in range(depth + 1):
+            key = codes >> np.uint64(3 * (depth - level))
+            new = np.empty(len(key), dtype=bool)
+            new[0] = True
+            np.not_equal(key[1:], key[:-1], out=new[1:])
+            start = np.flatnonzero(new)
+            count = np.diff(np.append(start, len(key)))
+            self.width.append(size / 2**level)
+            self.start.append(start)
+            self.count.append(count)
+            self.com.append(np.add.reduceat(self.pos, start, axis=0) / count[:, None])
+            self.cell.append(np.cumsum(new) - 1)
+            keys.append(key[start])
+
+        # Children of every cell are a contiguous range of cells on the next level
+        self.first_child, self.n_children = [], []
+        for level in range(depth):
+            parent = np.searchsorted(keys[level], keys[level + 1] >> np.uint64(3))
+            n_children = np.bincount(parent, minlength=len(keys[level]))
+            self.first_child.append(np.cumsum(n_children) - n_children)
+            self.n_children.append(n_children)
+
+    def repulsion(self, k: float, theta: float) -> np.ndarray:
+        """Approximates the repulsive forces k²/d between all points. Pairs of cells on the same level are traversed from the root down. Two cells interact through their centers of mass, if their width divided by the distance of their centers of mass is smaller than theta, two cells containing a single point each always do. The force a cell receives this way is expanded to first order around its center of mass and passed down to its points. Pairs of leaves which are too close are evaluated point by point.
+
+        Args:
+            k (float): optimal distance between nodes.
+            theta (float): opening angle.
+
+        Returns:
+            np.ndarray: repulsive force on every point, in the original order of the points.
+        """
+        n = len(self.pos)
+        k2 = k * k
+        theta2 = theta * theta
+        force = np.zeros((n, 3))
+        # Per level: force on every cell and its Jacobian (xx, yy, zz, xy, xz, yz)
+        field = [np.zeros((len(count), 3)) for count in self.count]
+        jacobian = [np.zeros((len(count), 6)) for count in self.count]
+
+        # Unordered pairs of cells, starting with the root paired with itself
+        a = np.zeros(1, dtype=np.int64)
+        b = np.zeros(1, dtype=np.int64)
+        for level in range(self.depth + 1):
+            count_a, count_b = self.count[level][a], self.count[level][b]
+            same = a == b
+            delta = self.com[level][a] - self.com[level][b]
+            dist2 = np.maximum(np.einsum("ij,ij->i", delta, delta), MIN_DIST**2)
+            wide = (count_a > 1) | (count_b > 1)
+            is_far = ~same & (self.width[level] ** 2 * wide < theta2 * dist2)
+            far = np.flatnonzero(is_far)
+            if len(far):
+                d = delta[far]
+                s = k2 / dist2[far]
+                ca, cb = count_a[far], count_b[far]
+                field[level] += _scatter(
+                    a[far], b[far], cb, -ca, d * s[:, None], len(field[level])
+                )
+                # Cells with a single point do not need the expansion
+                w = np.flatnonzero(wide[far])
+                dx, dy, dz = d[w].T
+                t = 2 * s[w] ** 2 / k2
+                J = np.column_stack(
+                    (
+                        s[w] - t * dx * dx,
+                        s[w] - t * dy * dy,
+                        s[w] - t * dz * dz,
+                        -t * dx * dy,
+                        -t * dx * dz,
+                        -t * dy * dz,
+                    )
+                )
+                jacobian[level] += _scatter(
+                    a[far][w], b[far][w], cb[w], ca[w], J, len(field[level])
+                )
+
+            # Cells which are too close are opened, a point paired with itself is dropped
+            near = ~is_far & ~(same & (count_a == 1))
+            a, b, same = a[near], b[near], same[near]
+            if level == self.depth:
+                # Leaves are evaluated point by point
+                ca, cb = self.count[level][a], self.count[level][b]
+                idx, offset = _expand(ca * cb)
+                p = self.start[level][a][idx] + offset // cb[idx]
+                q = self.start[level][b][idx] + offset % cb[idx]
+                keep = np.where(same[idx], p < q, True)
+                p, q = p[keep], q[keep]
+                delta = self.pos[p] - self.pos[q]
+                dist2 = np.maximum(np.einsum("ij,ij->i", delta, delta), MIN_DIST**2)
+                ones = np.ones(len(p))
+                force += _scatter(p, q, ones, -ones, delta * (k2 / dist2)[:, None], n)
+                break
+            if not len(a):
+                break
+            # Pairs of children, a cell paired with itself only needs every pair once
+            na, nb = self.n_children[level][a], self.n_children[level][b]
+            idx, offset = _expand(na * nb)
+            i, j = offset // nb[idx], offset % nb[idx]
+            keep = ~same[idx] | (i <= j)
+            idx, i, j = idx[keep], i[keep], j[keep]
+            a = self.first_child[level][a][idx] + i
+            b = self.first_child[level][b][idx] + j
+
+        for level in range(self.depth + 1):
+            cell = self.cell[level]
+            J = jacobian[level][cell]
+            x = self.pos - self.com[level][cell]
+            force += field[level][cell] + J[:, :3] * x
+            force[:, 0] += J[:, 3] * x[:, 1] + J[:, 4] * x[:, 2]
+            force[:, 1] += J[:, 3] * x[:, 0] + J[:, 5] * x[:, 2]
+            force[:, 2] += J[:, 4] * x[:, 0] + J[:, 5] * x[:, 1]
+
+        result = np.empty_like(force)
+        result[self.order] = force
+        return result
+
+
+def relax(
+    pos: np.ndarray,
+    start: np.ndarray,
+    end: np.ndarray,
+    weight: np.ndarray,
+    k: float,
+    iterations: int,
+    threshold: float,
+    theta: float = 0.7,
+    t: float = None,
+    deadline: float = None,
+) -> np.ndarray:
+    """Moves the nodes along the attractive and repulsive forces, while the temperature cools down linearly.
+
+    Args:
+        pos (np.ndarray): initial positions of the nodes with shape (n, 3). Is updated in place.
+        start (np.ndarray): start indices of the edges.
+        end (np.ndarray): end indices of the edges.
+        weight (np.ndarray): weights of the edges.
+        k (float): optimal distance between nodes.
+        iterations (int): maximal number of iterations.
+        threshold (float): the iterations stop, if the mean displacement of a node falls below this value.
+        theta (float, optional): opening angle of the Barnes-Hut approximation. Defaults to 0.7.
+        t (float, optional): initial temperature, the maximal displacement of a node in the first iteration. Defaults to None, in which case a tenth of the extent of the layout is used, as in networkx.
+        deadline (float, optional): time.monotonic() value after which the iterations stop, at least one iteration is done. Defaults to None.
+
+    Returns:
+        np.ndarray: the updated positions.
+    """
+    n = len(pos)
+    if t is None:
+        t = np.ptp(pos, axis=0).max() * 0.1
+    dt = t / (iterations + 1)
+    for _ in range(iterations):
+        displacement = _Octree(pos).repulsion(k, theta)
+        delta = pos[start] - pos[end]
+        dist = np.maximum(np.sqrt(np.einsum("ij,ij->i", delta, delta)), MIN_DIST)
+        attraction = delta * (weight * dist / k)[:, None]
+        for i in range(3):
+            displacement[:, i] -= np.bincount(start, attraction[:, i], minlength=n)
+            displacement[:, i] += np.bincount(end, attraction[:, i], minlength=n)
+
+        length = np.maximum(np.linalg.norm(displacement, axis=1), MIN_DIST)
+        delta_pos = displacement * (t / length)[:, None]
+        pos += delta_pos
+        t -= dt
+        if np.linalg.norm(delta_pos) / n < threshold:
+            break
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+    return pos
+
+
+def _rescale(pos: np.ndarray) -> np.ndarray:
+    """Centers the positions at the origin and scales them to [-1, 1]."""
+    pos -= pos.mean(axis=0)
+    pos /= max(np.abs(pos).max(), 1e-12)
+    return pos
+
+
+def barnes_hut_layout(
+    G: nx.Graph,
+    k: float = None,
+    iterations: int = 50,
+    threshold: float = 1e-4,
+    dim: int = 3,
+    theta: float = 0.7,
+    seed: int = None,
+    pos: dict = None,
+    deadline: float = None,
+) -> dict:
+    """Positions the nodes of a graph with a force directed algorithm. Uses the same forces, cooling and stopping criterion as networkx.spring_layout, but approximates the repulsive forces with a Barnes-Hut octree, which runs in O(n log n + m) per iteration instead of O(n²).
+
+    Args:
+        G (nx.Graph): graph to lay out.
+        k (float, optional): optimal distance between nodes. Defaults to None, in which case 1/sqrt(n) is used.
+        iterations (int, optional): maximal number of iterations. Defaults to 50.
+        threshold (float, optional): the iterations stop, if the mean displacement of a node falls below this value. Defaults to 1e-4.
+        dim (int, optional): dimension of the layout, only 3 is supported. Defaults to 3.
+        theta (float, optional): opening angle of the Barnes-Hut approximation. Smaller values are more accurate but slower. Defaults to 0.7.
+        seed (int, optional): seed of the random initial positions. Defaults to None.
+        pos (dict, optional): initial positions of the nodes, see initial_positions. The layout starts at a low temperature, so that it refines the given positions instead of replacing them. Defaults to None.
+        deadline (float, optional): time.monotonic() value after which the iterations stop with the current positions. Defaults to None.
+
+    Raises:
+        ValueError: If dim is not 3.
+
+    Returns:
+        dict: node ids as keys and three dimensional positions as values, centered at the origin and scaled to [-1, 1].
+    """
+    if dim != 3:
+        raise ValueError("The Barnes-Hut layout only supports three dimensions.")
+    nodes, start, end, weight = adjacency(G)
+    n = len(nodes)
+    if n == 0:
+        return {}
+    if n == 1:
+        return {nodes[0]: np.zeros(3)}
+
+    rng = np.random.default_rng(seed)
+    if k is None:
+        k = np.sqrt(1.0 / n)
+    t = None
+    if pos is not None:
+        pos = initial_positions(nodes, pos, rng)
+        t = k
+    else:
+        pos = rng.random((n, 3))
+    relax(pos, start, end, weight, k, iterations, threshold, theta, t, deadline)
+    return dict(zip(nodes, _rescale(pos)))
+
+
+def initial_positions(nodes: list, pos: dict, rng: np.random.Generator) -> np.ndarray:
+    """Scales given initial positions into the unit cube, in which random layouts start. Nodes without a position are placed randomly.
+
+    Args:
+        nodes (list): nodes of the graph.
+        pos (dict): node ids as keys and positions as values.
+        rng (np.random.Generator): random number generator.
+
+    Returns:
+        np.ndarray: initial positions with shape (n, 3).
+    """
+    init = rng.random((len(nodes), 3))
+    known = np.array([node in pos for node in nodes])
+    if known.any():
+        given = np.array([pos[node] for node in nodes if node in pos], dtype=float)
+        lo = given.min(axis=0)
+        span = max(np.ptp(given, axis=0).max(), 1e-12)
+        init[known] = (given - lo) / span
+    return init
+
+
+def coarsen(
+    n: int,
+    start: np.ndarray,
+    end: np.ndarray,
+    weight: np.ndarray,
+    rng: np.random.Generator,
+    rounds: int = 3,
+) -> tuple[np.ndarray, int, np.ndarray, np.ndarray, np.ndarray]:
+    """Coarsens a graph by a heavy edge matching. In every round, each unmatched node proposes to its unmatched neighbor with the heaviest edge and mutual proposals are collapsed into one node.
+
+    Args:
+        n (int): number of nodes.
+        start (np.ndarray): start indices of the edges.
+        end (np.ndarray): end indices of the edges.
+        weight (np.ndarray): weights of the edges.
+        rng (np.random.Generator): random number generator used to break ties.
+        rounds (int, optional): number of matching rounds. Defaults to 3.
+
+    Returns:
+        tuple[np.ndarray, int, np.ndarray, np.ndarray, np.ndarray]: coarse node of every node, number of coarse nodes and start indices, end indices and weights of the coarse edges.
+    """
+    mate = np.full(n, -1)
+    noise = rng.random(len(weight)) * 1e-6
+    for _ in range(rounds):
+        free = (mate[start] < 0) & (mate[end] < 0)
+        if not free.any():
+            break
+        a = np.concatenate([start[free], end[free]])
+        b = np.concatenate([end[free], start[free]])
+        score = np.tile(weight[free] + noise[free], 2)
+        order = np.lexsort((-score, a))
+        a, b = a[order], b[order]
+        first = np.ones(len(a), dtype=bool)
+        first[1:] = a[1:] != a[:-1]
+        proposal = np.full(n, -1)
+        proposal[a[first]] = b[first]
+        nodes = np.flatnonzero(proposal >= 0)
+        mutual = nodes[proposal[proposal[nodes]] == nodes]
+        mate[mutual] = proposal[mutual]
+
+    # Matched nodes share the coarse node of the smaller index
+    leader = np.where((mate >= 0) & (mate < np.arange(n)), mate, np.arange(n))
+    _, cluster = np.unique(leader, return_inverse=True)
+    n_coarse = cluster.max() + 1
+    A = sp.coo_matrix(
+        (weight, (cluster[start], cluster[end])), shape=(n_coarse, n_coarse)
+    ).tocsr()
+    A = sp.triu(A + A.T, k=1).tocoo()
+    return cluster, n_coarse, A.row, A.col, A.data
+
+
+def multilevel_layout(
+    G: nx.Graph,
+    k: float = None,
+    iterations: int = 50,
+    threshold: float = 1e-4,
+    dim: int = 3,
+    theta: float = 0.7,
+    seed: int = None,
+    min_nodes: int = 100,
+    pos: dict = None,
+    deadline: float = None,
+) -> dict:
+    """Positions the nodes of a graph with a multilevel force directed algorithm. The graph is coarsened by heavy edge matchings until it has less than min_nodes nodes or stops shrinking. The coarsest graph is laid out with the Barnes-Hut engine, then the positions are interpolated to the next finer graph and refined, level by level. As the global structure is already settled on the coarse levels, the expensive fine levels only need a few iterations at a low temperature.
+
+    Args:
+        G (nx.Graph): graph to lay out.
+        k (float, optional): optimal distance between nodes of the original graph. Defaults to None, in which case 1/sqrt(n) is used.
+        iterations (int, optional): number of iterations on the coarsest level, the finer levels use a third of it. Defaults to 50.
+        threshold (float, optional): the iterations of a level stop, if the mean displacement of a node falls below this value. Defaults to 1e-4.
+        dim (int, optional): dimension of the layout, only 3 is supported. Defaults to 3.
+        theta (float, optional): opening angle of the Barnes-Hut approximation. Defaults to 0.7.
+        seed (int, optional): seed of the random initial positions and the matchings. Defaults to None.
+        min_nodes (int, optional): the coarsening stops at this number of nodes. Defaults to 100.
+        pos (dict, optional): initial positions of the nodes, see initial_positions. If given, the positions are projected onto the coarsest graph, every coarse node is placed at the mean position of the nodes it contains, and the coarsest level starts at a low temperature. Defaults to None.
+        deadline (float, optional): time.monotonic() value after which the iterations of every level stop. The remaining levels are only interpolated. Defaults to None.
+
+    Raises:
+        ValueError: If dim is not 3.
+
+    Returns:
+        dict: node ids as keys and three dimensional positions as values, centered at the origin and scaled to [-1, 1].
+    """
+    if dim != 3:
+        raise ValueError("The multilevel layout only supports three dimensions.")
+    nodes, start, end, weight = adjacency(G)
+    n = len(nodes)
+    if n == 0:
+        return {}
+    if n == 1:
+        return {nodes[0]: np.zeros(3)}
+    if k is None:
+        k = np.sqrt(1.0 / n)
+
+    rng = np.random.default_rng(seed)
+    levels = [(n, start, end, weight)]
+    clusters = []
+    while levels[-1][0] > min_nodes:
+        cluster, *coarse = coarsen(*levels[-1], rng)
+        if coarse[0] > 0.9 * levels[-1][0]:
+            break
+        clusters.append(cluster)
+        levels.append(tuple(coarse))
+
+    # The optimal distance grows with the number of collapsed nodes
+    n_level, start, end, weight = levels[-1]
+    k_level = k * np.sqrt(n / n_level)
+    t = None
+    if pos is not None:
+        pos = initial_positions(nodes, pos, rng)
+        for cluster in clusters:
+            size = np.bincount(cluster)
+            pos = np.column_stack(
+                [np.bincount(cluster, pos[:, i]) / size for i in range(3)]
+            )
+        t = k_level
+    else:
+        pos = rng.random((n_level, 3))
+    relax(
+        pos,
+        start,
+        end,
+        weight,
+        k_level,
+        iterations,
+        threshold,
+        theta,
+        t,
+        deadline,
+    )
+    refine = max(10, iterations // 3)
+    for cluster, (n_level, start, end, weight) in zip(clusters[::-1], levels[-2::-1]):
+        k_level = k * np.sqrt(n / n_level)
+        pos = pos[cluster] + (rng.random((n_level, 3)) - 0.5) * k_level * 0.1
+        if deadline is not None and time.monotonic() >= deadline:
+            continue
+        relax(
+            pos,
+            start,
+            end,
+            weight,
+            k_level,
+            refine,
+            threshold,
+            theta,
+            k_level * 2,
+            deadline,
+        )
+    return dict(zip(nodes, _rescale(pos)))
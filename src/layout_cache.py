@@ -0,0 +1,151 @@
+"""On-disk cache of generated layouts.
+
+A layout is identified by a fingerprint of the graph (node ids and edge list), the layout algorithm, its variables and its seed. The normalized positions are stored as float32 arrays in the canonical node order of the fingerprint, one .npy file per layout. The least recently used layouts are evicted as soon as the cache exceeds its size limit.
+"""
+
+import hashlib
+import json
+import os
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from .layout_result import LayoutResult
+from . import settings
+from .settings import log
+
+
+def graph_fingerprint(G: nx.Graph) -> tuple[list, str]:
+    """Calculates a hash of the node ids and the edge list of a graph, which is independent of the order in which nodes and edges were added.
+
+    Args:
+        G (nx.Graph): Graph to fingerprint.
+
+    Returns:
+        tuple[list, str]: nodes in canonical order and the hash of the graph.
+    """
+    nodes = sorted(G.nodes(), key=str)
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = np.array(
+        [sorted((index[u], index[v])) for u, v in G.edges()], dtype=np.int64
+    ).reshape(-1, 2)
+    edges = edges[np.lexsort((edges[:, 1], edges[:, 0]))]
+    h = hashlib.blake2b(digest_size=16)
+    h.update("\0".join(map(str, nodes)).encode())
+    h.update(edges.tobytes())
+    return nodes, h.hexdigest()
+
+
+def layout_key(
+    fingerprint: str,
+    algo: str,
+    algo_variables: dict,
+    random_lay: bool = False,
+    feature_matrix: pd.DataFrame = None,
+    init_pos: dict = None,
+) -> str:
+    """Combines the fingerprint of a graph with everything else a layout depends on into a cache key.
+
+    Args:
+        fingerprint (str): fingerprint of the graph, see graph_fingerprint.
+        algo (str): name of the layout algorithm.
+        algo_variables (dict): variables of the algorithm, including its seed if one is set.
+        random_lay (bool, optional): Whether a random layout is generated. Defaults to False.
+        feature_matrix (pd.DataFrame, optional): feature matrix of a functional layout. Defaults to None.
+        init_pos (dict, optional): initial positions of a warm started layout. Defaults to None.
+
+    Returns:
+        str: key of the layout.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(fingerprint.encode())
+    h.update(
+        json.dumps(
+            [algo, algo_variables, random_lay], sort_keys=True, default=str
+        ).encode()
+    )
+    if feature_matrix is not None:
+        h.update(pd.util.hash_pandas_object(feature_matrix).values.tobytes())
+        h.update("\0".join(map(str, feature_matrix.columns)).encode())
+    if init_pos:
+        nodes = sorted(init_pos, key=str)
+        h.update("\0".join(map(str, nodes)).encode())
+        h.update(np.array([init_pos[n] for n in nodes], dtype=float).tobytes())
+    return h.hexdigest()
+
+
+class LayoutCache:
+    """Stores layouts as float32 arrays in a directory and evicts the least recently used ones, if the directory grows larger than max_size bytes."""
+
+    def __init__(self, location: str = None, max_size: int = None):
+        """Opens the cache. The defaults are read from settings when the cache is created, not when the module is imported.
+
+        Args:
+            location (str, optional): directory of the cache. Defaults to None, in which case settings.LAYOUT_CACHE is used.
+            max_size (int, optional): maximal size of the cache in bytes. Defaults to None, in which case settings.LAYOUT_CACHE_SIZE is used.
+        """
+        self.location = settings.LAYOUT_CACHE if location is None else location
+        self.max_size = settings.LAYOUT_CACHE_SIZE if max_size is None else max_size
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.location, f"{key}.npy")
+
+    def get(self, key: str, nodes: list) -> LayoutResult or None:
+        """Reads a layout from the cache.
+
+        Args:
+            key (str): key of the layout.
+            nodes (list): nodes in the canonical order of the fingerprint.
+
+        Returns:
+            LayoutResult or None: layout sorted by node id like Layouter.normalize_pos returns it. None if the layout is not cached.
+        """
+        file = self._file(key)
+        try:
+            pos = np.load(file)
+        except (OSError, ValueError):
+            return None
+        if pos.shape != (len(nodes), 3):
+            return None
+        # Mark as recently used
+        os.utime(file)
+        return LayoutResult(nodes, pos).sorted()
+
+    def put(self, key: str, nodes: list, layout: LayoutResult) -> None:
+        """Writes a layout to the cache and evicts old layouts if necessary.
+
+        Args:
+            key (str): key of the layout.
+            nodes (list): nodes in the canonical order of the fingerprint.
+            layout (LayoutResult): layout of the graph.
+        """
+        pos = layout.positions(nodes)
+        if np.isnan(pos).any():
+            return
+        file = self._file(key)
+        tmp = f"{file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.location, exist_ok=True)
+            with open(tmp, "wb") as f:
+                np.save(f, pos)
+            os.replace(tmp, file)
+            self.evict()
+        except OSError as e:
+            log.warning(f"Could not write layout to the layout cache: {e}")
+
+    def evict(self) -> None:
+        """Removes the least recently used layouts until the cache is smaller than max_size."""
+        entries = []
+        for file in os.listdir(self.location):
+            if not file.endswith(".npy"):
+                continue
+            stat = os.stat(os.path.join(self.location, file))
+            entries.append((stat.st_mtime, stat.st_size, file))
+        total = sum(size for _, size, _ in entries)
+        for _, size, file in sorted(entries):
+            if total <= self.max_size:
+                break
+            os.remove(os.path.join(self.location, file))
+            total -= size
+            log.debug(f"Evicted layout {file} from the layout cache.")
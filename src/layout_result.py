@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+
+def normalize(pos: np.ndarray, dim: int = 3) -> np.ndarray:
+    """Normalizes the first dim columns of a position array to be between 0 and 1.
+
+    Args:
+        pos (np.ndarray): (n, d) array of positions.
+        dim (int, optional): number of columns to normalize. Defaults to 3.
+
+    Returns:
+        np.ndarray: normalized float64 copy of pos.
+    """
+    pos = np.array(pos, dtype=np.float64)
+    if len(pos) == 0:
+        return pos
+    pos[:, :dim] += np.abs(pos[:, :dim].min(axis=0))
+    pos[:, :dim] /= pos[:, :dim].max(axis=0)
+    return pos
+
+
+class LayoutResult:
+    """Node layout backed by two arrays: the node ids and a contiguous float32 (n,3) array of their positions. Replaces the dicts with node ids as keys and positions as values."""
+
+    __slots__ = ("ids", "pos")
+
+    def __init__(self, ids: np.ndarray, pos: np.ndarray):
+        self.ids = np.asarray(ids)
+        self.pos = np.ascontiguousarray(pos, dtype=np.float32).reshape(len(self.ids), 3)
+
+    @classmethod
+    def from_dict(cls, layout: dict) -> "LayoutResult":
+        """Creates a layout from a dict with node ids as keys and positions as values."""
+        if not layout:
+            return cls(np.zeros(0, dtype=np.int64), np.zeros((0, 3)))
+        return cls(list(layout.keys()), np.array(list(layout.values())))
+
+    def to_dict(self) -> dict:
+        """Returns a dict with node ids as keys and positions as values."""
+        return dict(zip(self.ids.tolist(), self.pos))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def sorted(self) -> "LayoutResult":
+        """Returns the layout sorted by node id."""
+        order = np.argsort(self.ids, kind="stable")
+        return LayoutResult(self.ids[order], self.pos[order])
+
+    def normalized(self, dim: int = 3) -> "LayoutResult":
+        """Returns the layout sorted by node id with positions normalized to be between 0 and 1, see normalize."""
+        layout = self.sorted()
+        return LayoutResult(layout.ids, normalize(layout.pos, dim))
+
+    def without_z(self) -> "LayoutResult":
+        """Returns the layout projected onto the xy-plane."""
+        pos = self.pos.copy()
+        pos[:, 2] = 0
+        return LayoutResult(self.ids, pos)
+
+    def positions(self, ids: list or np.ndarray or pd.Index) -> np.ndarray:
+        """Looks up the positions of the given nodes.
+
+        Args:
+            ids (list or np.ndarray or pd.Index): node ids.
+
+        Returns:
+            np.ndarray: float32 array with shape (len(ids), 3). Positions of nodes which are not part of the layout are NaN.
+        """
+        loc = pd.Index(self.ids).get_indexer(ids)
+        pos = self.pos[loc]
+        pos[loc < 0] = np.nan
+        return pos
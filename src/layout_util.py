@@ -3,7 +3,6 @@ import os
 import networkx as nx
 import numpy
 import numpy as np
-import open3d as o3d
 
 _WORKING_DIR = os.path.dirname(os.path.abspath(__file__))
 _THIS_EXT = os.path.join(_WORKING_DIR, "..")
@@ -11,39 +10,108 @@ _THIS_EXT_STATIC_PATH = os.path.join(
     _WORKING_DIR, "..", "static"
 )  # Static path of this extension
 
-SPHERE = os.path.join(_THIS_EXT_STATIC_PATH, "resources", "sphere.ply")
-
 
 def sample_sphere_pcd(
     SAMPLE_POINTS=100,
     layout: list[list[float, float, float]] = [],
     debug=False,
 ) -> numpy.array:
-    """Utility function to sample points from a sphere. Can be used for functional layouts for node with no annotations.
+    """Utility function to sample points from a sphere. Can be used for functional layouts for node with no annotations. The points are evenly distributed on the bounding sphere of the layout, see fibonacci_sphere.
 
     Args:
         SAMPLE_POINTS (int, optional): Number of points to sample. Defaults to 100.
-        layout (list, optional): List of points if the calculated Layout. Is used to center the sphere around this layout. Defaults to [].
-        debug (bool, optional): Switch to show visualization of the process. Defaults to False.
+        layout (list, optional): List of points if the calculated Layout. Is used to center the sphere around this layout, its radius is the largest distance of a point to the center. Without points, the unit sphere around the origin is used. Defaults to [].
+        debug (bool, optional): Switch to show visualization of the process, needs open3d. Defaults to False.
 
     Returns:
         numpy.array: Array of sampled points with shape (SAMPLE_POINTS, 3)
     """
     if SAMPLE_POINTS == 0:
         return numpy.array([])
-    # get protein name & read mesh as .ply format
-    mesh = o3d.io.read_triangle_mesh(SPHERE)
-    mesh.compute_vertex_normals()
-    layout_pcd = o3d.geometry.PointCloud()
-    layout_pcd.points = o3d.utility.Vector3dVector(numpy.asarray(layout))
-    layout_pcd.paint_uniform_color([1, 0, 0])
-    layout_center = layout_pcd.get_center()
-    mesh.translate(layout_center, relative=False)
-    pcd = mesh.sample_points_uniformly(number_of_points=SAMPLE_POINTS)
-    pcd.paint_uniform_color([0, 1, 0])
+    layout = numpy.asarray(layout, dtype=float).reshape(-1, 3)
+    center, radius = numpy.zeros(3), 1.0
+    if len(layout) > 0:
+        center = layout.mean(axis=0)
+        radius = numpy.linalg.norm(layout - center, axis=1).max()
+        if radius == 0:
+            radius = 1.0
+    points = center + fibonacci_sphere(SAMPLE_POINTS) * radius
     if debug:
-        o3d.visualization.draw_geometries([pcd, layout_pcd])
-    return numpy.asarray(pcd.points)
+        visualize_layout(
+            numpy.vstack((layout, points)),
+            [[1, 0, 0]] * len(layout) + [[0, 1, 0]] * len(points),
+        )
+    return points
+
+
+def fibonacci_sphere(n: int) -> np.ndarray:
+    """Distributes n points evenly on the unit sphere along a Fibonacci spiral.
+
+    Args:
+        n (int): Number of points.
+
+    Returns:
+        np.ndarray: Array of points with shape (n, 3)
+    """
+    i = np.arange(n) + 0.5
+    z = 1 - 2 * i / n
+    r = np.sqrt(1 - z**2)
+    phi = np.pi * (3 - np.sqrt(5)) * i
+    return np.column_stack((r * np.cos(phi), r * np.sin(phi), z))
+
+
+def pack_spheres(
+    radii: np.ndarray, gap: float = 0.1, directions: int = 64
+) -> np.ndarray:
+    """Packs spheres around the first sphere without overlaps. The spheres are placed one after another, each one as close to the origin as possible. Larger spheres should come first to get a compact packing.
+
+    Args:
+        radii (np.ndarray): Radii of the spheres.
+        gap (float, optional): Minimal distance between two spheres relative to the radius of the first sphere. Defaults to 0.1.
+        directions (int, optional): Number of directions in which a position for a sphere is searched. Defaults to 64.
+
+    Returns:
+        np.ndarray: Centers of the spheres with shape (len(radii), 3)
+    """
+    radii = np.asarray(radii, dtype=float)
+    centers = np.zeros((len(radii), 3))
+    if len(radii) == 0:
+        return centers
+    gap *= radii[0]
+    candidates = fibonacci_sphere(directions)
+    for i in range(1, len(radii)):
+        dist = radii[0] + radii[i] + gap
+        while True:
+            pos = candidates * dist
+            free = (
+                np.linalg.norm(pos[:, None] - centers[None, :i], axis=2)
+                >= radii[:i] + radii[i] + gap
+            ).all(axis=1)
+            if free.any():
+                centers[i] = pos[np.argmax(free)]
+                break
+            dist += radii[i] / 2 + gap
+    return centers
+
+
+def pack_components(positions: list[np.ndarray]) -> list[np.ndarray]:
+    """Arranges the layouts of the connected components of a graph around each other. Every component is centered and scaled to a radius proportional to the cube root of its number of nodes, then the components are packed with pack_spheres. The largest component should come first.
+
+    Args:
+        positions (list[np.ndarray]): Positions of the nodes of every component with shape (n_i, 3).
+
+    Returns:
+        list[np.ndarray]: Packed positions of the nodes of every component.
+    """
+    radii = np.cbrt([len(pos) / len(positions[0]) for pos in positions])
+    centers = pack_spheres(radii)
+    packed = []
+    for pos, center, radius in zip(positions, centers, radii):
+        pos = np.array(pos, dtype=float)
+        pos -= pos.mean(axis=0)
+        pos *= radius / max(np.linalg.norm(pos, axis=1).max(), 1e-12)
+        packed.append(pos + center)
+    return packed
 
 
 def visualize_layout(
@@ -58,9 +126,14 @@ def visualize_layout(
         layout (list[list[float, float, float]]): List of points with shape (n, 3)
         colors (list[list[float, float, float]]): List of colors of the points with shape (n, 3)
 
+    Raises:
+        ImportError: If open3d is not installed.
+
     Returns:
         None: None
     """
+    import open3d as o3d
+
     pcd = o3d.geometry.PointCloud()
     pcd.points = o3d.utility.Vector3dVector(numpy.asarray(layout))
     pcd.colors = o3d.utility.Vector3dVector(numpy.asarray(colors))
@@ -1,14 +1,24 @@
 import json
 import os
-from multiprocessing import Pool
+import random
+import time
+from multiprocessing import Pool, current_process
 
-import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
 import pandas as pd
-import swifter
 
-from . import util
+from . import (
+    feature_knn,
+    force_layout,
+    layout_cache,
+    layout_util,
+    settings,
+    spectral_layout,
+    stress_layout,
+    topology_layout,
+    util,
+)
 from .classes import Evidences
 from .classes import LayoutAlgorithms as LA
 from .classes import LayoutTags as LT
@@ -16,29 +26,42 @@ from .classes import LinkTags as LiT
 from .classes import NodeTags as NT
 from .classes import StringTags as ST
 from .classes import VRNetzElements as VRNE
-from .settings import log
+from .feature_knn import KNNGraph, functional_features
+from .layout_result import LayoutResult, normalize
+from .settings import KAMADA_KAWAI_MAX_NODES, LAYOUT_WORKERS, log
 
 
 class Layouter:
     """Simple class to apply a 3D layout algorithm to a networkx graph."""
 
-    graph: nx.Graph = nx.Graph()
+    def __init__(self, graph: nx.Graph = None):
+        self.graph = nx.Graph() if graph is None else graph
+        # Set by apply_layout for the layouts of a single run
+        self.per_component = False
+        self.spectral_init = False
+        self.deadline = None
+        self.init_pos = None
+        self.cache_hits, self.cache_misses = 0, 0
+        self.n_workers = LAYOUT_WORKERS
+        self.layouts: dict[str, LayoutResult] = {}
 
     @staticmethod
-    def gen_graph(nodes: dict = None, links: dict = None) -> nx.Graph:
-        """Generates a networkx graph based on a dict of nodes and links.
+    def gen_graph(nodes: pd.DataFrame = None, links: pd.DataFrame = None) -> nx.Graph:
+        """Generates an attribute free networkx graph based on a data frame of nodes and links. The layout algorithms only need the structure of the graph, all attributes stay in the data frames.
 
         Args:
-            nodes (dict): contains all nodes that should be part of the graph with node ids as keys and nodes as values.
-            links (dict): contains all links that should be part of the graph with link ids as keys and links as values.
+            nodes (pd.DataFrame): contains all nodes that should be part of the graph, the index is used as node id.
+            links (pd.DataFrame): contains all links that should be part of the graph, their start and end columns refer to the node ids.
 
         Returns:
             networkx.Graph: Graph for which the layouts will be generated.
         """
         G = nx.Graph()
-        G.add_nodes_from([(idx, node.dropna()) for idx, node in nodes.iterrows()])
+        G.add_nodes_from(nodes.index.tolist())
         G.add_edges_from(
-            [(start, end) for start, end in links[[LiT.start, LiT.end]].values.tolist()]
+            zip(
+                links[LiT.start].to_numpy().tolist(), links[LiT.end].to_numpy().tolist()
+            )
         )
         return G
 
@@ -51,11 +74,13 @@ class Layouter:
         Returns:
             networkx.Graph: Graph for which the layouts will be generated.
         """
-        network = json.load(open(file))
+        with open(file) as f:
+            network = json.load(f)
+        network[VRNE.nodes] = pd.DataFrame(network[VRNE.nodes])
+        network[VRNE.links] = pd.DataFrame(network[VRNE.links])
         self.network = network
-        nodes = network[VRNE.nodes]
-        links = network[VRNE.links]
-        return self.gen_graph(nodes, links)
+        self.graph = self.gen_graph(network[VRNE.nodes], network[VRNE.links])
+        return self.graph
 
     def get_node_data(self, node: str) -> dict:
         """Get the data of the desired node.
@@ -92,14 +117,16 @@ class Layouter:
         self.graph = nx.read_graphml(file)
         return self.graph
 
-    def create_spring_layout(self, algo_variables: dict, random_lay: bool) -> dict:
+    def create_spring_layout(
+        self, algo_variables: dict, random_lay: bool
+    ) -> LayoutResult:
         """Generates a spring layout for the Graph using the networkx spring_layout algorithm. All nodes without a link will be placed on a sphere around the center of the graph.
 
         Args:
             algo_variables (dict): contains variables for the algorithm.
 
         Returns:
-            dict: node ids as keys and three dimensional positions as values.
+            LayoutResult: node ids and their three dimensional positions.
         """
         k = algo_variables.get("opt_dist")
         if k is not None:
@@ -119,32 +146,121 @@ class Layouter:
             self.graph, dim=3, k=k, iterations=iterations, threshold=threshold
         )
 
-    def create_kamada_kawai_layout(self, algo_variables: dict, random_lay) -> dict:
-        """Generates a kamada kawai layout for the Graph using the networkx kamada_kawai_layout algorithm. All nodes without a link will be placed on a sphere around the center of the graph.
+    @staticmethod
+    def force_variables(algo_variables: dict) -> dict:
+        """Converts the spring variables of the upload form or the command line to the arguments of the force directed layouts of force_layout. Values of the form arrive as strings, empty values fall back to the defaults.
 
         Args:
-            algo_variables (dict): contains variables for the algorithm. Does not do anything.
+            algo_variables (dict): contains "opt_dist", "iterations" and "threshold".
+
         Returns:
-            dict: node ids as keys and three dimensional positions as values.
+            dict: "k", "iterations" and "threshold" for the layout function.
         """
+        k = algo_variables.get("opt_dist")
+        k = float(k) if k not in (None, "") else None
+        if k is not None and k <= 0:
+            k = None
+        iterations = algo_variables.get("iterations")
+        threshold = algo_variables.get("threshold")
+        return {
+            "k": k,
+            "iterations": int(iterations) if iterations not in (None, "") else 50,
+            "threshold": float(threshold) if threshold not in (None, "") else 0.0001,
+        }
+
+    def create_barnes_hut_layout(
+        self, algo_variables: dict, random_lay: bool
+    ) -> LayoutResult:
+        """Generates a force directed layout for the Graph using the Barnes-Hut approximation of force_layout.barnes_hut_layout. Takes the same variables as the spring layout, but scales to graphs with tens of thousands of nodes. All nodes without a link will be placed on a sphere around the center of the graph.
+
+        Args:
+            algo_variables (dict): contains variables for the algorithm, see force_variables.
+
+        Returns:
+            LayoutResult: node ids and their three dimensional positions.
+        """
+        algo_variables = self.force_variables(algo_variables)
         return self.link_based_layout(
-            nx.kamada_kawai_layout, algo_variables, random_lay
+            force_layout.barnes_hut_layout, algo_variables, random_lay
         )
+
+    def create_multilevel_layout(
+        self, algo_variables: dict, random_lay: bool
+    ) -> LayoutResult:
+        """Generates a multilevel force directed layout for the Graph using force_layout.multilevel_layout. The graph is coarsened, the coarsest graph is laid out and the layout is refined level by level. Takes the same variables as the spring layout. All nodes without a link will be placed on a sphere around the center of the graph.
+
+        Args:
+            algo_variables (dict): contains variables for the algorithm, see force_variables.
+
+        Returns:
+            LayoutResult: node ids and their three dimensional positions.
+        """
+        algo_variables = self.force_variables(algo_variables)
+        return self.link_based_layout(
+            force_layout.multilevel_layout, algo_variables, random_lay
+        )
+
+    def create_kamada_kawai_layout(
+        self, algo_variables: dict, random_lay
+    ) -> LayoutResult:
+        """Generates a kamada kawai layout for the Graph using the networkx kamada_kawai_layout algorithm. Graphs with more than settings.KAMADA_KAWAI_MAX_NODES nodes are laid out with the stress layout instead, see kamada_kawai_layout. All nodes without a link will be placed on a sphere around the center of the graph.
+
+        Args:
+            algo_variables (dict): contains variables for the algorithm. Does not do anything.
+        Returns:
+            LayoutResult: node ids and their three dimensional positions.
+        """
+        return self.link_based_layout(kamada_kawai_layout, {}, random_lay)
         if random_lay:
             return self.create_random_layout()
         return nx.kamada_kawai_layout(self.graph, dim=3)
 
-    def create_random_layout(self, graph=None, algo_variables: dict = {}) -> dict:
+    def create_stress_layout(
+        self, algo_variables: dict, random_lay: bool
+    ) -> LayoutResult:
+        """Generates a stress layout for the Graph using stress_layout.stress_layout. Approximates the Kamada-Kawai layout with the distances to a few pivot nodes and scales to graphs with tens of thousands of nodes. All nodes without a link will be placed on a sphere around the center of the graph.
+
+        Args:
+            algo_variables (dict): contains variables for the algorithm.
+
+        Returns:
+            LayoutResult: node ids and their three dimensional positions.
+        """
+        algo_variables = {
+            "pivots": int(algo_variables.get("pivots", 50)),
+            "iterations": int(algo_variables.get("iterations", 100)),
+            "threshold": algo_variables.get("threshold", 0.0001),
+        }
+        return self.link_based_layout(
+            stress_layout.stress_layout, algo_variables, random_lay
+        )
+
+    def create_spectral_layout(
+        self, algo_variables: dict, random_lay: bool
+    ) -> LayoutResult:
+        """Generates a spectral layout for the Graph using spectral_layout.spectral_layout, which places the nodes with the eigenvectors of the normalized adjacency matrix. All nodes without a link will be placed on a sphere around the center of the graph.
+
+        Args:
+            algo_variables (dict): contains variables for the algorithm. Does not do anything.
+
+        Returns:
+            LayoutResult: node ids and their three dimensional positions.
+        """
+        return self.link_based_layout(spectral_layout.spectral_layout, {}, random_lay)
+
+    def create_random_layout(
+        self, graph=None, algo_variables: dict = {}
+    ) -> LayoutResult:
         """Generates a random layout for the Graph using the networkx random_layout algorithm.
 
         Args:
             algo_variables (dict): contains variables for the algorithm. Does not do anything.
         Returns:
-            dict: node ids as keys and three dimensional positions as values.
+            LayoutResult: node ids and their three dimensional positions.
         """
         if graph is None:
             graph = self.graph
-        return nx.random_layout(graph, dim=3)
+        return LayoutResult.from_dict(nx.random_layout(graph, dim=3))
 
     def create_cartoGRAPH_layout(
         self,
@@ -153,24 +269,24 @@ class Layouter:
         feature_matrix: pd.DataFrame = None,
         max_num_features: int = None,
         random=False,
-    ) -> dict:
-        """Will pick the correct cartoGRAPHs layout algorithm and apply it to the graph. If cartoGRAPH is not installed an ImportError is raised. In link based algorithms all nodes without a link will be placed on a sphere around the center of the graph. In functional algorithms all nodes without a feature will be placed on a sphere around the center of the graph.
+        knn_graph: KNNGraph = None,
+    ) -> LayoutResult:
+        """Will pick the correct cartoGRAPHs layout algorithm and apply it to the graph. If cartoGRAPH is not installed, the layouts which need it raise an ImportError. In link based algorithms all nodes without a link will be placed on a sphere around the center of the graph. In functional algorithms all nodes without a feature will be placed on a sphere around the center of the graph. The local and global UMAP layouts are computed with topology_layout instead of cartoGRAPHs. None of these layouts can be interrupted, if there is a time budget, see apply_layout, the spectral layout of the graph is used instead and functional layouts use the spectral layout of the kNN graph of the feature matrix, see functional_spectral_layout.
 
         Args:
             layout_algo (str): layout algorithm to choose. possible algorithms are listed in setting.LayoutAlgroithms.
             cg_variables (dict, optional): contains algorithm variables. Defaults to None.
+            knn_graph (KNNGraph, optional): Jaccard kNN graph of the feature matrix, see feature_knn.jaccard_knn. If it matches the feature matrix and has at least n_neighbors neighbors, the functional UMAP layout uses it as precomputed_knn instead of computing the distances again. Defaults to None.
 
         Raises:
-            ImportError: If cartoGRAPHs is not installed.
+            ImportError: If cartoGRAPHs is not installed and the chosen algorithm needs it.
             NotImplementedError: If the chosen algorithm is not implemented yet ("topographic" and "geodesic")
 
         Returns:
-            dict: node ids as keys and three dimensional positions as values.
+            LayoutResult: node ids and their three dimensional positions.
         """
-        import cartoGRAPHs as cg
-
         dim = 3
-        if "functional" in layout_algo:
+        if "functional" in layout_algo and feature_matrix is not None:
             features = feature_matrix.any(axis=1)
             no_feature_index = feature_matrix[~features].copy().index
 
@@ -181,7 +297,27 @@ class Layouter:
             feature_graph = self.graph.subgraph(feature_matrix.index)
             sphere_graph = self.graph.subgraph(no_feature_index)
 
+        if self.deadline is not None and not random:
+            log.debug(
+                f"{layout_algo} cannot be interrupted, using the spectral layout to keep the time budget."
+            )
+            if "functional" not in layout_algo:
+                return self.link_based_layout(
+                    spectral_layout.spectral_layout, {}, random
+                )
+            if feature_matrix is None:
+                return ValueError("No feature matrix given.")
+            functional = self.functional_spectral_layout(
+                feature_matrix,
+                knn_graph,
+                int((cg_variables or {}).get("n_neighbors", 10)),
+            )
+            functional.update(sample_sphere(sphere_graph, list(functional.values())))
+            return LayoutResult.from_dict(functional)
+
         if "tsne" in layout_algo:
+            import cartoGRAPHs as cg
+
             algo_variables = {
                 "prplxty": cg_variables.get("prplxty", 50),
                 "density": cg_variables.get("density", 12),
@@ -198,32 +334,52 @@ class Layouter:
                 if feature_matrix is None:
                     return ValueError("No feature matrix given.")
                 if random:
-                    functional = self.create_random_layout(feature_graph)
+                    functional = nx.random_layout(feature_graph, dim=3)
                 else:
                     functional = cg.layout_functional_tsne(
                         feature_graph, feature_matrix, dim, **algo_variables
                     )
                 layout = sample_sphere(sphere_graph, list(functional.values()))
                 functional.update(layout)
-                return functional
+                return LayoutResult.from_dict(functional)
         elif "umap" in layout_algo:
             algo_variables = {
                 "n_neighbors": cg_variables.get("n_neighbors", 10),
                 "spread": cg_variables.get("spread", 1.0),
                 "min_dist": cg_variables.get("min_dist", 0.1),
             }
+            # Native implementations on the sparse adjacency matrix, the ones of cartoGRAPHs build dense matrices
             if "local" in layout_algo:
-                function = cg.layout_local_umap
+                function = topology_layout.local_layout
             elif "global" in layout_algo:
-                function = cg.layout_global_umap
+                function = topology_layout.global_layout
             elif "importance" in layout_algo:
+                import cartoGRAPHs as cg
+
                 function = cg.layout_importance_umap
             elif "functional" in layout_algo:
                 if feature_matrix is None:
                     return ValueError("No feature matrix given.")
                 if random:
-                    functional = self.create_random_layout(feature_graph)
+                    functional = nx.random_layout(feature_graph, dim=3)
+                elif (
+                    knn_graph is not None
+                    and knn_graph.n_neighbors
+                    >= min(algo_variables["n_neighbors"], len(feature_matrix))
+                    and knn_graph.matches(functional_features(feature_matrix))
+                ):
+                    log.debug("Gen functional layout from the precomputed kNN graph")
+                    features = functional_features(feature_matrix)
+                    embedding = feature_knn.umap_embedding(
+                        features.to_numpy(dtype=bool),
+                        knn_graph,
+                        dim,
+                        **algo_variables,
+                    )
+                    functional = dict(zip(features.index, embedding))
                 else:
+                    import cartoGRAPHs as cg
+
                     log.debug("Gen functional layout")
                     functional = cg.layout_functional_umap(
                         feature_graph,
@@ -233,10 +389,12 @@ class Layouter:
                     )
                 layout = sample_sphere(sphere_graph, list(functional.values()))
                 functional.update(layout)
-                return functional
+                return LayoutResult.from_dict(functional)
 
         elif "topographic" in layout_algo:
             raise NotImplementedError("Topographic layout not implemented yet!")
+            import cartoGRAPHs as cg
+
             # d_z = a dictionary with keys=G.nodes and values=any int/float assigned to a node
             posG2D = nx.Graph()
             z_list = [np.random.random() for i in range(0, len(list(posG2D.nodes())))]
@@ -245,6 +403,8 @@ class Layouter:
 
         elif "geodesic" in layout_algo:
             raise NotImplementedError("Geodesic layout not implemented yet!")
+            import cartoGRAPHs as cg
+
             d_radius = 1
             n_neighbors = 8
             spread = 1.0
@@ -258,10 +418,39 @@ class Layouter:
 
         return self.link_based_layout(function, algo_variables, random)
 
+    @staticmethod
+    def functional_spectral_layout(
+        feature_matrix: pd.DataFrame, knn_graph: KNNGraph = None, n_neighbors: int = 10
+    ) -> dict:
+        """Generates a fast functional layout: the spectral layout of the Jaccard kNN graph of the feature matrix.
+
+        Args:
+            feature_matrix (pd.DataFrame): feature matrix of the nodes with at least one feature.
+            knn_graph (KNNGraph, optional): precomputed kNN graph of the feature matrix. Defaults to None, in which case it is computed.
+            n_neighbors (int, optional): number of neighbors of every node in the kNN graph. Defaults to 10.
+
+        Returns:
+            dict: node ids as keys and three dimensional positions as values.
+        """
+        features = functional_features(feature_matrix)
+        if knn_graph is None or not knn_graph.matches(features):
+            knn_graph = feature_knn.jaccard_knn(features, n_neighbors)
+        knn = knn_graph.truncated(n_neighbors)
+        G = nx.Graph()
+        G.add_nodes_from(knn.ids)
+        G.add_edges_from(
+            zip(
+                np.repeat(knn.ids, knn.n_neighbors - 1),
+                knn.ids[knn.indices[:, 1:]].ravel(),
+            )
+        )
+        G.remove_edges_from(nx.selfloop_edges(G))
+        return spectral_layout.spectral_layout(G)
+
     def link_based_layout(
         self, layout_algo, algo_variables: dict, random_lay: bool, G: nx.Graph = None
-    ) -> dict[str, list[float, float, float]]:
-        """Will apply a link based layout algorithm to the graph. All nodes with degree 0 will be placed on a sphere around the graph.
+    ) -> LayoutResult:
+        """Will apply a link based layout algorithm to the graph. All nodes with degree 0 will be placed on a sphere around the graph. If there is a time budget, see apply_layout, the layout functions in DEADLINE_ALGOS stop at self.deadline with their current positions and the ones in BUDGET_FALLBACKS are replaced by a faster function which does.
 
         Args:
             layout_algo (Callable): Layout function to apply.
@@ -270,7 +459,7 @@ class Layouter:
             G (networkx, optional): . Defaults to None. If None, self.graph will be used.
 
         Returns:
-            dict[str,list[float,float,float]]: node ids as keys and three dimensional positions as values.
+            LayoutResult: node ids and their three dimensional positions.
         """
         if G is None:
             G = self.graph
@@ -286,14 +475,104 @@ class Layouter:
         # has_links = G
         # no_links = []
 
+        if self.deadline is not None and layout_algo in BUDGET_FALLBACKS:
+            log.debug(
+                f"{layout_algo.__name__} cannot be interrupted, using {BUDGET_FALLBACKS[layout_algo].__name__} to keep the time budget."
+            )
+            layout_algo = BUDGET_FALLBACKS[layout_algo]
+        if self.deadline is not None and layout_algo in DEADLINE_ALGOS:
+            algo_variables = {**algo_variables, "deadline": self.deadline}
+
+        if self.init_pos and layout_algo in WARM_START_ALGOS:
+            algo_variables = self.warm_start_variables(algo_variables, has_links)
+        elif self.spectral_init and layout_algo in WARM_START_ALGOS:
+            log.debug("Starting from the spectral layout.")
+            algo_variables = {
+                **algo_variables,
+                "pos": spectral_layout.spectral_layout(has_links),
+            }
+
         if random_lay:
-            layout = self.create_random_layout(has_links)
+            layout = nx.random_layout(has_links, dim=3)
+        elif self.per_component:
+            layout = self.component_layout(
+                layout_algo, algo_variables, has_links, self.n_workers
+            )
         else:
             layout = layout_algo(has_links, **algo_variables, dim=3)
 
         if len(no_links) > 0:
             no_links_layout = sample_sphere(no_links, list(layout.values()))
             layout.update(no_links_layout)
+        return LayoutResult.from_dict(layout)
+
+    def warm_start_variables(self, algo_variables: dict, G: nx.Graph) -> dict:
+        """Adds the initial positions of self.init_pos to the variables of a layout algorithm. Nodes without an initial position are placed next to their neighbors. As only these nodes have to find their place, the number of iterations is reduced to a fifth.
+
+        Args:
+            algo_variables (dict): dict with algorithm variables.
+            G (nx.Graph): Graph which is laid out.
+
+        Returns:
+            dict: algorithm variables with initial positions.
+        """
+        pos = warm_start_positions(G, self.init_pos)
+        log.debug(
+            f"Warm start with {sum(n in self.init_pos for n in G)} of {len(G)} known positions."
+        )
+        algo_variables = {**algo_variables, "pos": pos}
+        if algo_variables.get("iterations"):
+            algo_variables["iterations"] = max(
+                5, int(algo_variables["iterations"]) // 5
+            )
+        return algo_variables
+
+    @staticmethod
+    def component_layout(
+        layout_algo, algo_variables: dict, G: nx.Graph, n_workers: int = None
+    ) -> dict[str, list[float, float, float]]:
+        """Applies a layout algorithm to every connected component of the graph separately. The components are laid out concurrently in a process pool. Afterwards, every component is scaled to a radius proportional to the cube root of its number of nodes and the components are packed around the largest one.
+
+        Args:
+            layout_algo (Callable): Layout function to apply.
+            algo_variables (dict): dict with algorithm variables.
+            G (nx.Graph): Graph without nodes of degree 0.
+            n_workers (int, optional): Number of processes. Defaults to None, in which case settings.LAYOUT_WORKERS is used.
+
+        Returns:
+            dict[str,list[float,float,float]]: node ids as keys and three dimensional positions as values.
+        """
+        if n_workers is None:
+            n_workers = LAYOUT_WORKERS
+        if current_process().daemon:
+            # Already running in the process pool of apply_layout, which cannot have child processes
+            n_workers = 1
+        components = sorted(nx.connected_components(G), key=len, reverse=True)
+        log.debug(
+            f"Laying out {len(components)} components with {n_workers} processes."
+        )
+        jobs = []
+        for c in components:
+            variables = algo_variables
+            if "pos" in variables:
+                variables = {**variables, "pos": {n: variables["pos"][n] for n in c}}
+            jobs.append((layout_algo, G.subgraph(c).copy(), variables))
+        n_workers = min(n_workers, len(jobs))
+        if n_workers > 1:
+            with Pool(n_workers) as pool:
+                # The largest components come first, small ones are sent in chunks
+                layouts = pool.map(
+                    _layout_component,
+                    jobs,
+                    chunksize=max(1, len(jobs) // n_workers // 4),
+                )
+        else:
+            layouts = [_layout_component(job) for job in jobs]
+
+        packed = layout_util.pack_components([list(lay.values()) for lay in layouts])
+        layout = {}
+        for lay, pos in zip(layouts, packed):
+            layout.update(zip(lay.keys(), pos))
         return layout
 
     def apply_layout(
@@ -303,91 +582,192 @@ class Layouter:
         feature_matrices: list[pd.DataFrame] = None,
         max_num_features: int = None,
         random_lay=False,
-    ) -> dict[str, list[float, float, float]]:
+        use_cache: bool = True,
+        init_pos: dict = None,
+        n_workers: int = None,
+        knn_graphs: list[KNNGraph] = None,
+    ) -> dict[int, LayoutResult]:
         """Applies a layout algorithm and adds the node positions to nodes in the self.network[VRNE.nodes] list.
 
         Args:
             layout_algo (str, optional): layout algorithm to choose. possible algorithms are listed in setting.LayoutAlgroithms.. Defaults to None.
-            algo_variables (dict, optional): Contains algorithm variables. Defaults to None.. Defaults to {}.
+            algo_variables (dict, optional): Contains algorithm variables. If "per_component" is True, link based algorithms lay out every connected component separately. If "spectral_init" is True, the spring, kamada_kawai, barnes_hut, multilevel and stress layouts start from the spectral layout instead of random positions. If "time_budget_s" is set, the layouts stop after this many seconds, see the time budget of link_based_layout and create_cartoGRAPH_layout. Defaults to None.. Defaults to {}.
+            use_cache (bool, optional): If True, layouts are read from and written to the layout cache at settings.LAYOUT_CACHE. The number of hits and misses is stored in self.cache_hits and self.cache_misses. Defaults to True.
+            init_pos (dict, optional): Existing node positions with node ids as keys. If given, the spring, kamada_kawai, barnes_hut, multilevel and stress layouts start from these positions and only refine them. Defaults to None.
+            n_workers (int, optional): Number of processes in which the layouts are computed concurrently. The graph and the feature matrices are shared with the processes, results are returned in the order of layout_algo. Defaults to None, in which case settings.LAYOUT_WORKERS is used, which runs the layouts one after another. Processes are forked, so only use several of them outside of a multi-threaded server.
+            knn_graphs (list[KNNGraph], optional): precomputed kNN graphs of the feature matrices, see create_cartoGRAPH_layout. Defaults to None.
 
         Returns:
-            dict[str,list[float,float,float]]: with node ids as keys and three dimensional node positions as values.
+            dict[int,LayoutResult]: index of the layout algorithm as keys and the normalized layouts as values.
         """
         layouts = {}
+        self.per_component = (algo_variables or {}).get("per_component", False)
+        self.spectral_init = (algo_variables or {}).get("spectral_init", False)
+        time_budget = (algo_variables or {}).get("time_budget_s")
+        self.deadline = time.monotonic() + time_budget if time_budget else None
+        self.init_pos = init_pos
+        self.cache_hits, self.cache_misses = 0, 0
+        cache = None
+        # Read at runtime, so the cache can be moved or turned off after the import
+        if use_cache and settings.LAYOUT_CACHE is not None:
+            cache = layout_cache.LayoutCache()
+            nodes, fingerprint = layout_cache.graph_fingerprint(self.graph)
         if isinstance(layout_algo, str):
             layout_algo = [layout_algo]
+        pending = []
         for idx, algo in enumerate(layout_algo):
             if algo is None:
                 """Select default layout algorithm"""
                 algo = LA.spring
-            if LA.cartoGRAPH in algo:
-                log.debug(f"Applying layout: {algo}.", flush=True)
-                if feature_matrices is None:
-                    layout = self.create_cartoGRAPH_layout(
-                        algo, algo_variables, random_lay
-                    )
-                else:
-                    layout = self.create_cartoGRAPH_layout(
-                        algo,
-                        algo_variables,
-                        feature_matrices[idx],
-                        max_num_features,
-                        random_lay,
-                    )
+            key = None
+            if cache is not None:
+                feature_matrix = None
+                if LA.cartoGRAPH in algo and feature_matrices is not None:
+                    feature_matrix = feature_matrices[idx]
+                key = layout_cache.layout_key(
+                    fingerprint,
+                    algo,
+                    algo_variables,
+                    random_lay,
+                    feature_matrix,
+                    init_pos,
+                )
+                layout = cache.get(key, nodes)
+                if layout is not None:
+                    log.debug(f"Layout {algo} read from the layout cache.")
+                    self.cache_hits += 1
+                    layouts[idx] = layout
+                    continue
+                self.cache_misses += 1
+            pending.append((idx, algo, key))
+
+        if n_workers is None:
+            n_workers = LAYOUT_WORKERS
+        if current_process().daemon:
+            # Already running in a process pool, e.g. of construct_interactomes --parallel
+            n_workers = 1
+        # The components of a per component layout use the same number of processes
+        self.n_workers = n_workers
+        n_workers = min(n_workers, len(pending))
+        args = (
+            algo_variables,
+            feature_matrices,
+            max_num_features,
+            random_lay,
+            knn_graphs,
+        )
+        if n_workers > 1:
+            log.debug(f"Applying {len(pending)} layouts with {n_workers} processes.")
+            # The layouter is handed to the workers once, with fork it is not even copied
+            with Pool(
+                n_workers, initializer=_init_layout_worker, initargs=(self, args)
+            ) as pool:
+                results = pool.map(
+                    _apply_layout_worker,
+                    [(idx, algo) for idx, algo, _ in pending],
+                    chunksize=1,
+                )
+        else:
+            results = [self.create_layout(idx, algo, *args) for idx, algo, _ in pending]
 
-                if isinstance(layout, ValueError):
-                    log.error(
-                        "Error in executing cartoGRAPHs layout. Create a layout with spring instead."
-                    )
-                    layout = self.create_spring_layout(algo_variables)
+        for (idx, _, key), layout in zip(pending, results):
+            layouts[idx] = layout
+            if cache is not None:
+                cache.put(key, nodes, layout)
+        return dict(sorted(layouts.items()))
+
+    def create_layout(
+        self,
+        idx: int,
+        algo: str,
+        algo_variables: dict,
+        feature_matrices: list[pd.DataFrame] = None,
+        max_num_features: int = None,
+        random_lay: bool = False,
+        knn_graphs: list[KNNGraph] = None,
+    ) -> LayoutResult:
+        """Applies a single layout algorithm to the graph, see apply_layout.
+
+        Args:
+            idx (int): index of the layout, selects the feature matrix of a functional layout.
+            algo (str): layout algorithm to choose.
+            algo_variables (dict): Contains algorithm variables.
+            feature_matrices (list[pd.DataFrame], optional): feature matrices of the functional layouts. Defaults to None.
+            max_num_features (int, optional): maximal number of features of a functional layout. Defaults to None.
+            random_lay (bool, optional): If True, a random layout will be applied. Defaults to False.
+            knn_graphs (list[KNNGraph], optional): precomputed kNN graphs of the feature matrices. Defaults to None.
+
+        Returns:
+            LayoutResult: node ids and their normalized three dimensional positions, sorted by node id.
+        """
+        if LA.cartoGRAPH in algo:
+            log.debug(f"Applying layout: {algo}.", flush=True)
+            if feature_matrices is None:
+                layout = self.create_cartoGRAPH_layout(algo, algo_variables, random_lay)
             else:
-                lay_func = {
-                    LA.spring: self.create_spring_layout,
-                    LA.kamada_kawai: self.create_kamada_kawai_layout,
-                    LA.random: self.create_random_layout,
-                }
-                log.debug(f"Applying layout: {algo}", flush=True)
-                layout = lay_func[algo](
-                    algo_variables, random_lay
-                )  # Will use the desired layout algorithm
-            layouts[idx] = self.normalize_pos(layout)
-        return layouts
+                layout = self.create_cartoGRAPH_layout(
+                    algo,
+                    algo_variables,
+                    feature_matrices[idx],
+                    max_num_features,
+                    random_lay,
+                    knn_graphs[idx] if knn_graphs is not None else None,
+                )
+
+            if isinstance(layout, ValueError):
+                log.error(
+                    "Error in executing cartoGRAPHs layout. Create a layout with spring instead."
+                )
+                layout = self.create_spring_layout(algo_variables)
+        else:
+            lay_func = {
+                LA.spring: self.create_spring_layout,
+                LA.kamada_kawai: self.create_kamada_kawai_layout,
+                LA.barnes_hut: self.create_barnes_hut_layout,
+                LA.multilevel: self.create_multilevel_layout,
+                LA.stress: self.create_stress_layout,
+                LA.spectral: self.create_spectral_layout,
+                LA.random: self.create_random_layout,
+            }
+            log.debug(f"Applying layout: {algo}", flush=True)
+            layout = lay_func[algo](
+                algo_variables, random_lay
+            )  # Will use the desired layout algorithm
+        return self.normalize_pos(layout)
 
     @staticmethod
     def normalize_pos(
-        layout: dict[int, np.array], dim: int = 3
-    ) -> dict[str, list[float, float, float]]:
+        layout: LayoutResult or dict[int, np.array], dim: int = 3
+    ) -> LayoutResult:
         """
         Normalizes the positions of the nodes in the layout to be between 0 and 1.
 
         Args:
-            layout (dict[int, np.array]): Dictionary containing node ids as keys and a 3-tuple of coordinates as values.
+            layout (LayoutResult or dict[int, np.array]): Layout or dictionary containing node ids as keys and a 3-tuple of coordinates as values.
             dim (int, optional): Defines the dimension in which the coordinates are. Defaults to 3.
 
         Returns:
-            dict[str,list[float,float,float]]: Dictionary containing node ids as keys and a 3-tuple of coordinates as values. Now normalized in the range of 0 to 1.
+            LayoutResult: Layout sorted by node id. Now normalized in the range of 0 to 1.
         """
-        layout = dict(sorted(layout.items(), key=lambda x: x[0]))
-        pos = np.array(list(layout.values()))
-        for i in range(0, dim):
-            pos[:, i] += abs(min(pos[:, i]))
-            pos[:, i] /= max(pos[:, i])
-        layout = dict(zip(layout.keys(), pos))
-        return layout
+        if isinstance(layout, dict):
+            layout = LayoutResult.from_dict(layout)
+        return layout.normalized(dim)
 
     @staticmethod
     def add_layout_to_vrnetz(
-        nodes: pd.DataFrame, layout: dict, layout_name: str
+        nodes: pd.DataFrame, layout: LayoutResult, layout_name: str
     ) -> pd.DataFrame:
         """Adds the points of the generated layout to the underlying VRNetz
 
         Args:
-            layout (dict): Dictionary containing node ids as keys and a 3-tuple of coordinates as values.
+            layout (LayoutResult): Layout of the nodes, node ids refer to the index of nodes.
             layout_name (str): Name of the layout to be added to the VRNetz.
 
         Returns:
             pd.DataFrame: nodes data frame with added layout.
         """
+        import swifter
+
         if NT.layouts in nodes:
 
             def extract_cy(x):
@@ -401,20 +781,20 @@ class Layouter:
 
             nodes = nodes.swifter.progress_bar(False).apply(extract_cy, axis=1)
 
-        pos = np.array(list((layout.values())))
-        _2d_layout = pos[:, :2]
-        z_zero = np.zeros((len(layout), 1))
-        _2d_layout = np.hstack((_2d_layout, z_zero))
+        pos = layout.positions(nodes.index)
+        _2d_layout = pos.copy()
+        _2d_layout[:, 2] = 0
 
-        nodes[layout_name + "2d_pos"] = pd.Series(_2d_layout.tolist())
-        nodes[layout_name + "_pos"] = pd.Series(pos.tolist())
+        nodes[layout_name + "2d_pos"] = pd.Series(
+            _2d_layout.tolist(), index=nodes.index
+        )
+        nodes[layout_name + "_pos"] = pd.Series(pos.tolist(), index=nodes.index)
 
         if "cy_pos" and "cy_col" in nodes:
-            # Check if this works, as it now returns a np array
-            coords = nodes["cy_pos"].to_dict()
-            pos = np.array(list(Layouter.normalize_pos(coords, dim=2).values()))
+            coords = nodes["cy_pos"].sort_index()
+            pos = normalize(coords.tolist(), dim=2)[:, :2]
             pos = np.hstack((pos, np.zeros((len(pos), 1))))
-            nodes["cy_pos"] = pd.Series(pos.tolist())
+            nodes["cy_pos"] = pd.Series(pos.tolist(), index=coords.index)
 
             def extract_color(x):
                 """Scale alpha channel (glowing effect) with node size (max size = 1"""
@@ -448,6 +828,8 @@ class Layouter:
         Returns:
             dict: Network dictionary with the link layout information.
         """
+        import swifter
+
         # Set up the colors for each evidence type
         if evidences is None:
             evidences = Evidences.get_default_scheme()
@@ -497,6 +879,7 @@ class Layouter:
             links (pd.DataFrame): Data frame containing all the links.
             stringify (bool): Boolean which indicates whether the network is a STRING network or not, if not only the "any" evidence type is considered.
         """
+        import swifter
 
         def gen_color(x, color):
             x = color[:3] + (int(x * 255),)
@@ -512,7 +895,104 @@ class Layouter:
         return this
 
 
-from . import layout_util
+def kamada_kawai_layout(G: nx.Graph, dim: int = 3, pos: dict = None) -> dict:
+    """Applies networkx's kamada_kawai_layout, which needs the distances of all pairs of nodes. Above settings.KAMADA_KAWAI_MAX_NODES nodes, this takes too much time and memory and the stress layout is used instead."""
+    if len(G) > KAMADA_KAWAI_MAX_NODES:
+        log.debug(
+            f"{len(G)} nodes are too many for kamada_kawai, using the stress layout."
+        )
+        return stress_layout.stress_layout(G, dim=dim, pos=pos)
+    return nx.kamada_kawai_layout(G, dim=dim, pos=pos)
+
+
+# Layout functions which stop at a deadline
+DEADLINE_ALGOS = [
+    force_layout.barnes_hut_layout,
+    force_layout.multilevel_layout,
+    stress_layout.stress_layout,
+]
+# Layout functions which cannot be interrupted and their replacements, if there is a time budget
+BUDGET_FALLBACKS = {
+    nx.spring_layout: force_layout.barnes_hut_layout,
+    kamada_kawai_layout: stress_layout.stress_layout,
+}
+
+# Layout functions which accept initial positions
+WARM_START_ALGOS = [
+    nx.spring_layout,
+    kamada_kawai_layout,
+    force_layout.barnes_hut_layout,
+    force_layout.multilevel_layout,
+    stress_layout.stress_layout,
+]
+
+
+def warm_start_positions(G: nx.Graph, init_pos: dict, seed: int = None) -> dict:
+    """Completes initial positions for a graph. Nodes without a position are placed at the mean position of their placed neighbors, which is repeated until no further node can be placed. Remaining nodes are placed randomly within the bounding box of the known positions. If the known positions are flat, e.g. 2D Cytoscape coordinates, they are slightly perturbed along the flat axes so that the layout can unfold in 3D.
+
+    Args:
+        G (nx.Graph): Graph for which the positions are needed.
+        init_pos (dict): known positions with node ids as keys.
+        seed (int, optional): seed of the random number generator. Defaults to None.
+
+    Returns:
+        dict: node ids as keys and three dimensional positions as values for all nodes of G.
+    """
+    rng = np.random.default_rng(seed)
+    known = [n for n in G if n in init_pos]
+    if not known:
+        return {n: p for n, p in zip(G, rng.random((len(G), 3)))}
+    given = np.array([init_pos[n] for n in known], dtype=float)
+    lo, hi = given.min(axis=0), given.max(axis=0)
+    span = max((hi - lo).max(), 1e-12)
+    flat = (hi - lo) < 1e-6 * span
+    given[:, flat] += rng.normal(scale=0.05 * span, size=(len(given), flat.sum()))
+    pos = dict(zip(known, given))
+
+    pending = [n for n in G if n not in pos]
+    while pending:
+        remaining = []
+        for n in pending:
+            neighbors = [pos[m] for m in G[n] if m in pos]
+            if neighbors:
+                pos[n] = np.mean(neighbors, axis=0) + rng.normal(
+                    scale=0.01 * span, size=3
+                )
+            else:
+                remaining.append(n)
+        if len(remaining) == len(pending):
+            break
+        pending = remaining
+    for n in pending:
+        pos[n] = lo + rng.random(3) * (hi - lo)
+    return pos
+
+
+_LAYOUT_WORKER = {}
+
+
+def _init_layout_worker(layouter: Layouter, args: tuple) -> None:
+    """Initializes a process of the pool of Layouter.apply_layout."""
+    # Forked processes inherit the state of the random number generators
+    np.random.seed()
+    random.seed()
+    _LAYOUT_WORKER["layouter"] = layouter
+    _LAYOUT_WORKER["args"] = args
+
+
+def _apply_layout_worker(job: tuple) -> dict:
+    """Applies a single layout in a process of the pool of Layouter.apply_layout."""
+    idx, algo = job
+    return _LAYOUT_WORKER["layouter"].create_layout(idx, algo, *_LAYOUT_WORKER["args"])
+
+
+def _layout_component(job: tuple) -> dict:
+    """Applies a layout function to a single connected component. Is executed in the process pool of Layouter.component_layout."""
+    layout_algo, G, algo_variables = job
+    if len(G) <= 2:
+        # Nothing to optimize
+        return {n: np.array([i, 0.0, 0.0]) for i, n in enumerate(G.nodes())}
+    return layout_algo(G, **algo_variables, dim=3)
 
 
 def sample_sphere(
@@ -529,10 +1009,7 @@ def sample_sphere(
     """
     n = len(G)
     pos = layout_util.sample_sphere_pcd(SAMPLE_POINTS=n, layout=layout, *args, **kwargs)
-    layout = {}
-    for i, node in enumerate(G.nodes()):
-        layout[node] = pos[i]
-    return layout
+    return dict(zip(G.nodes(), pos))
 
 
 def visualize_layout(layout: list[float, float, float], *args, **kwargs):
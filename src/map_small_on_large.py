@@ -1,7 +1,5 @@
 import warnings
 
-import swifter
-
 warnings.simplefilter(action="ignore", category=FutureWarning)
 
 import pandas as pd
@@ -18,7 +16,6 @@ from .settings import (
     _MAPPING_ARBITARY_COLOR,
     _NETWORKS_PATH,
     _PROJECTS_PATH,
-    MAX_NUM_LINKS,
     log,
 )
 from .uploader import Uploader
@@ -36,6 +33,8 @@ def map_nodes(
     Return:
         tuple[pd.DataFrame,pd.DataFrame]: Mapped nodes and target nodes with additional attributes from the source network.
     """
+    import swifter
+
     # Split identifier into taxid and gene name
     if ST.stringdb_identifier in src_nodes:
 
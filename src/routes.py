@@ -3,12 +3,14 @@ import os
 
 import flask
 import GlobalData as GD
+import numpy as np
 import pandas as pd
 from PIL import Image
 from project import Project
 
 import uploader
 
+from . import column_store
 from . import settings as st
 from . import upload_interactomes
 from . import util as string_util
@@ -117,7 +119,18 @@ def preview():
     if not project.exists():
         return error_function()
 
-    project.read_all_jsons()
+    project.read_pfile()
+    project.read_names()
+    # Use the columnar copy of the project if available, parsing the JSON files is slow for large networks
+    node_names = column_store.read_column(project.location, "nodes", "n")
+    link_s = column_store.read_column(project.location, "links", "s")
+    link_e = column_store.read_column(project.location, "links", "e")
+    if node_names is None or link_s is None or link_e is None:
+        project.read_nodes()
+        project.read_links()
+        node_names = [node["n"] for node in project.nodes["nodes"]]
+        link_s = [link["s"] for link in project.links["links"]]
+        link_e = [link["e"] for link in project.links["links"]]
 
     layoutindex = flask.request.args.get("layout")
     if layoutindex is None:
@@ -144,7 +157,7 @@ def preview():
 
     nlength = len(project.names["names"])
 
-    length = len(project.links["links"])
+    length = len(link_s)
 
     nodes_im = os.path.join(
         project.layouts_dir,
@@ -186,16 +199,18 @@ def preview():
 
             newnode["p"] = pos
             newnode["c"] = pixel_valuesc[i]
-            newnode["n"] = project.nodes["nodes"][i]["n"]
+            newnode["n"] = node_names[i]
             testNetwork["nodes"].append(newnode)
 
     if length > 30000:
         length = 30000
+    link_s = np.asarray(link_s[:length]).tolist()
+    link_e = np.asarray(link_e[:length]).tolist()
     for x in range(length):
         newLink = {}
         newLink["id"] = x
-        newLink["s"] = project.links["links"][x]["s"]
-        newLink["e"] = project.links["links"][x]["e"]
+        newLink["s"] = link_s[x]
+        newLink["e"] = link_e[x]
         newLink["c"] = pixel_valueslc[x]
         testNetwork["links"].append(newLink)
 
@@ -4,13 +4,13 @@ import random
 import traceback
 
 import pandas as pd
-import py4cytoscape as p4c
 import requests
 from PIL import Image
 
 import GlobalData as GD
 from project import Project
 
+from . import column_store
 from . import settings as st
 from . import util as string_util
 from .classes import NodeTags as NT
@@ -51,6 +51,8 @@ def send_to_cytoscape(
     if len(selected) == 0 and len(selected_links) == 0:
         return
 
+    import py4cytoscape as p4c
+
     port = 1234
     layout = message.get("layout", "")
     color = message.get("color", "")
@@ -173,10 +175,15 @@ def extract_node_data(
     Returns:
         tuple(pd.DataFrame,list[int]): Nodes data and selected nodes as nodes list gets reduced to a total of maximal 2000 nodes.
     """
-    project = Project(project)
-    project.read_nodes()
+    import swifter
+
+    project = Project(project, read=False)
+    project.read_pfile()
     project.read_names()
-    nodes_data = pd.DataFrame(project.nodes["nodes"])
+    nodes_data = column_store.read_table(project.location, "nodes", skip=["layouts"])
+    if nodes_data is None:
+        project.read_nodes()
+        nodes_data = pd.DataFrame(project.nodes["nodes"])
     nodes_data = nodes_data[nodes_data.index.isin(selected_nodes)].copy()
 
     if "layouts" in nodes_data.columns:
@@ -276,10 +283,11 @@ def extract_link_data(
     Returns:
         pd.DataFrame: Extracted link data.
     """
-    project = Project(project)
-    project.read_links()
-    project.read_names()
-    links_data = pd.DataFrame(project.links["links"])
+    project = Project(project, read=False)
+    links_data = column_store.read_table(project.location, "links")
+    if links_data is None:
+        project.read_links()
+        links_data = pd.DataFrame(project.links["links"])
     if selected_links:
         links_data = links_data[links_data.index.isin(selected_links)]
     links_data["s"] = links_data["s"].astype(str)
@@ -36,7 +36,19 @@ os.makedirs(_NETWORKS_PATH, exist_ok=os.X_OK)
 
 UNIPROT_MAP = os.path.join(_STATIC_PATH, "uniprot_mapping.csv")
 _MAPPING_ARBITARY_COLOR = [255, 255, 255]
-MAX_NUM_LINKS = 262144
+LINK_BUDGET = None  # Maximal number of links of a network, None keeps all links
+# Threads used to encode and write textures, only pays off with several CPU cores
+TEXTURE_WORKERS = 1
+# Processes used to lay out several layouts or the connected components of a network. The processes are forked, which is not safe in the threaded server, so parallel layouts are only turned on by the interactome scripts
+LAYOUT_WORKERS = 1
+# Layouts are cached in the user cache directory, outside of the served static folder. None disables the cache
+_CACHE_PATH = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+    os.path.expanduser("~"), ".cache"
+)
+LAYOUT_CACHE = os.path.join(_CACHE_PATH, "StringEx", "layouts")
+LAYOUT_CACHE_SIZE = 512 * 2**20  # Maximal size of the layout cache in bytes
+# Larger graphs are laid out with the stress layout instead of kamada_kawai
+KAMADA_KAWAI_MAX_NODES = 1000
 log = logger.get_logger(
     level=_LOG_LEVEL,
     f_level=F_LOG_LEVEL,
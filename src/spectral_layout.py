@@ -0,0 +1,84 @@
+"""Spectral 3D layout for large graphs.
+
+The nodes are placed at the entries of the eigenvectors of the three largest non-trivial eigenvalues of the normalized adjacency matrix, which are the eigenvectors of the smallest non-trivial eigenvalues of the normalized Laplacian. They are computed with the sparse Lanczos solver of scipy.sparse.linalg.eigsh, which only needs products with the adjacency matrix. Every connected component is embedded on its own, otherwise the eigenvectors would only separate the components. The layout is cheap even for 100k nodes and captures the global structure of the graph, which makes it a good starting point for the force directed engines.
+"""
+
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+
+from . import layout_util
+from .force_layout import _rescale, adjacency
+
+DENSE_NODES = 500  # Smaller components are solved with a dense eigensolver
+
+
+def spectral_positions(A: sp.csr_matrix, rng: np.random.Generator) -> np.ndarray:
+    """Computes the spectral embedding of a connected graph.
+
+    Args:
+        A (sp.csr_matrix): symmetric adjacency matrix of the graph.
+        rng (np.random.Generator): random number generator for the start vector of the solver.
+
+    Returns:
+        np.ndarray: positions with shape (n, 3).
+    """
+    from scipy.sparse.linalg import ArpackNoConvergence, eigsh
+
+    n = A.shape[0]
+    pos = rng.random((n, 3)) * 1e-6
+    if n <= 2:
+        pos[:, 0] += np.arange(n)
+        return pos
+    scale = 1 / np.sqrt(np.asarray(A.sum(axis=1)).ravel())
+    N = sp.diags(scale) @ A @ sp.diags(scale)
+    if n <= DENSE_NODES:
+        values, vectors = np.linalg.eigh(N.toarray())
+    else:
+        try:
+            values, vectors = eigsh(N, k=4, which="LA", tol=1e-6, v0=rng.random(n))
+        except ArpackNoConvergence as e:
+            values, vectors = e.eigenvalues, e.eigenvectors
+    # The largest eigenvalue belongs to the trivial eigenvector
+    order = np.argsort(values)[::-1][1:4]
+    pos[:, : len(order)] += scale[:, None] * vectors[:, order]
+    return pos
+
+
+def spectral_layout(G: nx.Graph, dim: int = 3, seed: int = None) -> dict:
+    """Positions the nodes of a graph with the eigenvectors of its normalized adjacency matrix, see spectral_positions. The connected components are embedded separately and packed with layout_util.pack_components. Edge weights are taken from the "weight" attribute, they default to 1.
+
+    Args:
+        G (nx.Graph): graph to lay out.
+        dim (int, optional): dimension of the layout, only 3 is supported. Defaults to 3.
+        seed (int, optional): seed of the start vector of the eigensolver. Defaults to None.
+
+    Raises:
+        ValueError: If dim is not 3.
+
+    Returns:
+        dict: node ids as keys and three dimensional positions as values, centered at the origin and scaled to [-1, 1].
+    """
+    from scipy.sparse.csgraph import connected_components
+
+    if dim != 3:
+        raise ValueError("The spectral layout only supports three dimensions.")
+    nodes, start, end, weight = adjacency(G)
+    n = len(nodes)
+    if n == 0:
+        return {}
+    if n == 1:
+        return {nodes[0]: np.zeros(3)}
+
+    rng = np.random.default_rng(seed)
+    A = sp.coo_matrix((weight, (start, end)), shape=(n, n)).tocsr()
+    A = A + A.T
+    n_components, labels = connected_components(A, directed=False)
+    members = np.argsort(labels, kind="stable")
+    sizes = np.bincount(labels, minlength=n_components)
+    components = sorted(np.split(members, np.cumsum(sizes)[:-1]), key=len, reverse=True)
+    positions = [spectral_positions(A[c][:, c], rng) for c in components]
+    pos = np.zeros((n, 3))
+    for c, packed in zip(components, layout_util.pack_components(positions)):
+        pos[c] = packed
+    return dict(zip(nodes, _rescale(pos)))
@@ -0,0 +1,193 @@
+"""Stress based 3D layout for large graphs.
+
+Kamada-Kawai minimizes the stress between the layout distances and the shortest path distances of all pairs of nodes, which needs the dense n×n distance matrix. Here, the distances are only computed from a small number of pivots with a breadth first search each. The layout is initialized with pivot MDS and refined with sparse stress majorization, in which every node is attracted to its neighbors at distance 1 and to the pivots at their graph distance. Memory and time per iteration are O(k·n + m) for k pivots and m edges.
+"""
+
+import time
+
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+
+from .force_layout import _rescale, adjacency, initial_positions
+
+
+def pivot_distances(
+    A: sp.csr_matrix, k: int, rng: np.random.Generator
+) -> tuple[np.ndarray, np.ndarray]:
+    """Selects k pivots by max-min sampling and computes their hop distances to all nodes. The first pivot is random, every further pivot is the node farthest away from all pivots selected so far. Unreachable nodes get the largest finite distance plus one.
+
+    Args:
+        A (sp.csr_matrix): symmetric adjacency matrix.
+        k (int): number of pivots.
+        rng (np.random.Generator): random number generator.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: indices of the pivots and their distances with shape (k, n).
+    """
+    from scipy.sparse.csgraph import dijkstra
+
+    n = A.shape[0]
+    pivots = np.zeros(k, dtype=np.int64)
+    dist = np.zeros((k, n))
+    nearest = np.full(n, np.inf)
+    pivot = rng.integers(n)
+    for i in range(k):
+        pivots[i] = pivot
+        dist[i] = dijkstra(A, unweighted=True, indices=pivot)
+        nearest = np.minimum(nearest, dist[i])
+        # Prefer unreachable nodes, so that every component gets a pivot
+        pivot = np.argmax(np.where(np.isinf(nearest), np.finfo(float).max, nearest))
+    finite = np.isfinite(dist)
+    dist[~finite] = dist[finite].max() + 1
+    return pivots, dist
+
+
+def pivot_mds(dist: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Computes positions which approximate the distances to the pivots by classical MDS of the n×k distance matrix (Brandes & Pich, 2007).
+
+    Args:
+        dist (np.ndarray): distances of the pivots with shape (k, n).
+        rng (np.random.Generator): random number generator, fills dimensions for which there are not enough pivots.
+
+    Returns:
+        np.ndarray: positions with shape (n, 3).
+    """
+    C = dist.T**2
+    C = -0.5 * (C - C.mean(axis=0) - C.mean(axis=1)[:, None] + C.mean())
+    values, vectors = np.linalg.eigh(C.T @ C)
+    top = np.argsort(values)[::-1][:3]
+    pos = rng.random((len(C), 3)) * 1e-3
+    pos[:, : len(top)] += C @ vectors[:, top]
+    return pos
+
+
+def stress_terms(
+    start: np.ndarray,
+    end: np.ndarray,
+    pivots: np.ndarray,
+    dist: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Collects the terms of the sparse stress (Ortmann et al., 2016). Every edge is a term with distance 1 in both directions. Every node has a term for every pivot, which stands for the nodes of the pivot's region that are closer to the pivot than half of its distance to the node, and is weighted by their number.
+
+    Args:
+        start (np.ndarray): start indices of the edges.
+        end (np.ndarray): end indices of the edges.
+        pivots (np.ndarray): indices of the pivots.
+        dist (np.ndarray): distances of the pivots with shape (k, n).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: node that is moved, node it is attracted to, target distance and weight of every term.
+    """
+    k, n = dist.shape
+    region = np.argmin(dist, axis=0)
+    sources, targets, distances, weights = [start, end], [end, start], [], []
+    distances.append(np.ones(2 * len(start)))
+    weights.append(np.ones(2 * len(start)))
+    for i, pivot in enumerate(pivots):
+        d = dist[i]
+        keep = d > 1
+        members = np.sort(d[region == i])
+        count = np.searchsorted(members, d[keep] / 2, side="right")
+        sources.append(np.flatnonzero(keep))
+        targets.append(np.full(keep.sum(), pivot))
+        distances.append(d[keep])
+        weights.append(np.maximum(count, 1) / d[keep] ** 2)
+    return (
+        np.concatenate(sources),
+        np.concatenate(targets),
+        np.concatenate(distances),
+        np.concatenate(weights),
+    )
+
+
+def majorize(
+    pos: np.ndarray,
+    terms: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    iterations: int,
+    threshold: float,
+    deadline: float = None,
+) -> np.ndarray:
+    """Minimizes the stress of the given terms by localized stress majorization, all nodes are moved at once in every iteration.
+
+    Args:
+        pos (np.ndarray): initial positions with shape (n, 3).
+        terms (tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]): terms of the stress, see stress_terms.
+        iterations (int): maximal number of iterations.
+        threshold (float): the iterations stop, if the stress decreases by less than this fraction.
+        deadline (float, optional): time.monotonic() value after which the iterations stop, at least one iteration is done. Defaults to None.
+
+    Returns:
+        np.ndarray: the updated positions.
+    """
+    source, target, distance, weight = terms
+    n = len(pos)
+    total = np.bincount(source, weight, minlength=n)
+    total[total == 0] = 1
+    stress = np.inf
+    for _ in range(iterations):
+        delta = pos[source] - pos[target]
+        norm = np.maximum(np.sqrt(np.einsum("ij,ij->i", delta, delta)), 1e-9)
+        new_stress = np.sum(weight * (norm - distance) ** 2)
+        if stress - new_stress < threshold * stress:
+            break
+        stress = new_stress
+        update = pos[target] + delta * (distance / norm)[:, None]
+        pos = np.column_stack(
+            [np.bincount(source, weight * update[:, i], minlength=n) for i in range(3)]
+        )
+        pos /= total[:, None]
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+    return pos
+
+
+def stress_layout(
+    G: nx.Graph,
+    pivots: int = 50,
+    iterations: int = 100,
+    threshold: float = 1e-4,
+    dim: int = 3,
+    seed: int = None,
+    pos: dict = None,
+    deadline: float = None,
+) -> dict:
+    """Positions the nodes of a graph by minimizing the stress between the layout distances and the graph distances, like Kamada-Kawai, but without all pairs shortest paths. Edge weights are ignored, all edges have length 1.
+
+    Args:
+        G (nx.Graph): graph to lay out.
+        pivots (int, optional): number of pivots from which the graph distances are computed. Defaults to 50.
+        iterations (int, optional): maximal number of stress majorization iterations. Defaults to 100.
+        threshold (float, optional): the iterations stop, if the stress decreases by less than this fraction. Defaults to 1e-4.
+        dim (int, optional): dimension of the layout, only 3 is supported. Defaults to 3.
+        seed (int, optional): seed of the pivot selection. Defaults to None.
+        pos (dict, optional): initial positions of the nodes, see force_layout.initial_positions. If given, they replace the pivot MDS initialization. Defaults to None.
+        deadline (float, optional): time.monotonic() value after which the stress majorization stops with the current positions. Defaults to None.
+
+    Raises:
+        ValueError: If dim is not 3.
+
+    Returns:
+        dict: node ids as keys and three dimensional positions as values, centered at the origin and scaled to [-1, 1].
+    """
+    if dim != 3:
+        raise ValueError("The stress layout only supports three dimensions.")
+    nodes, start, end, _ = adjacency(G)
+    n = len(nodes)
+    if n == 0:
+        return {}
+    if n == 1:
+        return {nodes[0]: np.zeros(3)}
+
+    rng = np.random.default_rng(seed)
+    A = sp.coo_matrix((np.ones(len(start)), (start, end)), shape=(n, n)).tocsr()
+    A = A + A.T
+    pivots, dist = pivot_distances(A, min(pivots, n), rng)
+    if pos is not None:
+        pos = initial_positions(nodes, pos, rng) * dist.max()
+    else:
+        pos = pivot_mds(dist, rng)
+    pos = majorize(
+        pos, stress_terms(start, end, pivots, dist), iterations, threshold, deadline
+    )
+    return dict(zip(nodes, _rescale(pos)))
@@ -0,0 +1,295 @@
+import hashlib
+import pickle
+
+import numpy as np
+import pandas as pd
+from PIL import Image
+
+NODE_TEX_WIDTH = 128
+NODES_PER_TEX_BLOCK = 128 * 128
+POS_SCALE = 65280
+DEFAULT_NODE_ALPHA = 255 // 2
+DEFAULT_LINK_ALPHA = 255
+NOT_SELECTED_COLOR = (255, 255, 255, 10)
+LINK_TEX_WIDTH = 1024
+LINK_RGB_TEX_WIDTH = 512
+LINK_TEX_HEIGHT = 512
+LINKS_PER_PAGE = LINK_RGB_TEX_WIDTH * LINK_TEX_HEIGHT
+
+
+def node_texture_height(n: int) -> int:
+    """Height of the node textures needed to store n nodes.
+
+    Args:
+        n (int): number of nodes.
+
+    Returns:
+        int: height of the texture in pixels.
+    """
+    return NODE_TEX_WIDTH * (int(n / NODES_PER_TEX_BLOCK) + 1)
+
+
+def num_pages(n: int) -> int:
+    """Number of link texture pages needed to store n links.
+
+    Args:
+        n (int): number of links.
+
+    Returns:
+        int: number of pages, at least 1.
+    """
+    return max(1, -(-n // LINKS_PER_PAGE))
+
+
+def page_name(name: str, page: int) -> str:
+    """Name of a page of a link texture. The first page keeps the name of the texture, further pages get the page index as suffix.
+
+    Args:
+        name (str): name of the texture, e.g. "anyXYZ".
+        page (int): index of the page.
+
+    Returns:
+        str: name of the page, e.g. "anyXYZ_1".
+    """
+    if page == 0:
+        return name
+    return f"{name}_{page}"
+
+
+def positions_to_array(pos: pd.Series or np.ndarray) -> np.ndarray:
+    """Converts a Series of [x, y, z] lists into a (n,3) float array. Missing positions are set to 0.
+
+    Args:
+        pos (pd.Series or np.ndarray): positions of the nodes.
+
+    Returns:
+        np.ndarray: float64 array with shape (n, 3).
+    """
+    if isinstance(pos, np.ndarray) and pos.ndim == 2:
+        return np.asarray(pos, dtype=np.float64)
+    values = [p if pd.api.types.is_list_like(p) else (0, 0, 0) for p in pos]
+    if len(values) == 0:
+        return np.zeros((0, 3), dtype=np.float64)
+    arr = np.array(values, dtype=np.float64)
+    return np.nan_to_num(arr, nan=0.0)
+
+
+def colors_to_array(
+    colors: pd.Series or np.ndarray, default_alpha: int = DEFAULT_NODE_ALPHA
+) -> np.ndarray:
+    """Converts a Series of RGB(A) lists into a (n,4) uint8 array. Colors without an alpha channel get default_alpha, missing colors are fully transparent black. Values are clipped to 0 to 255.
+
+    Missing colors are masked out first. If the remaining colors have the same number of channels, the array is built in a single call of np.array, otherwise they are grouped by their number of channels and every group is converted at once.
+
+    Args:
+        colors (pd.Series or np.ndarray): colors of the elements.
+        default_alpha (int, optional): alpha value used for RGB colors. Defaults to DEFAULT_NODE_ALPHA.
+
+    Returns:
+        np.ndarray: uint8 array with shape (n, 4).
+    """
+    if isinstance(colors, np.ndarray) and colors.ndim == 2:
+        return _rgba(colors, default_alpha)
+    colors = (
+        pd.Series(colors, dtype=object) if not isinstance(colors, pd.Series) else colors
+    )
+    arr = np.zeros((len(colors), 4), dtype=np.uint8)
+    present = colors.notna().to_numpy()
+    if not present.any():
+        return arr
+    colors = colors[present]
+    try:
+        values = np.array(colors.tolist(), dtype=np.float64)
+    except (ValueError, TypeError):
+        values = None
+    if values is not None and values.ndim == 2 and values.shape[1] >= 3:
+        arr[present] = _rgba(values, default_alpha)
+        return arr
+
+    channels = np.zeros(len(colors), dtype=np.int64)
+    is_color = colors.map(type).isin((list, tuple, np.ndarray)).to_numpy()
+    channels[is_color] = colors[is_color].map(len).to_numpy()
+    rows = np.flatnonzero(present)
+    for n_channels in np.unique(channels[channels >= 3]):
+        group = channels == n_channels
+        values = np.array(colors[group].tolist(), dtype=np.float64)
+        arr[rows[group]] = _rgba(values, default_alpha)
+    return arr
+
+
+def _rgba(colors: np.ndarray, default_alpha: int) -> np.ndarray:
+    """Clips a (n, >=3) color array to uint8 RGBA, RGB colors get default_alpha."""
+    colors = np.nan_to_num(np.asarray(colors, dtype=np.float64)[:, :4], nan=0.0)
+    arr = np.full((len(colors), 4), default_alpha, dtype=np.uint8)
+    arr[:, : colors.shape[1]] = np.clip(colors, 0, 255)
+    return arr
+
+
+def link_pixels(node_ids: pd.Series or np.ndarray) -> np.ndarray:
+    """Converts node ids into the (x % 128, x // 128 % 128, x // 16384) pixel triplets used by the link textures. Missing ids are mapped to (0, 0, 0).
+
+    Args:
+        node_ids (pd.Series or np.ndarray): start or end node ids of the links.
+
+    Returns:
+        np.ndarray: int64 array with shape (m, 3).
+    """
+    ids = pd.to_numeric(pd.Series(node_ids), errors="coerce").to_numpy(
+        dtype=np.float64, na_value=0
+    )
+    ids = ids.astype(np.int64)
+    return np.stack((ids % 128, ids // 128 % 128, ids // 16384), axis=1)
+
+
+def encode_link_positions(
+    start: np.ndarray,
+    end: np.ndarray,
+    height: int = LINK_TEX_HEIGHT,
+) -> np.ndarray:
+    """Encodes start and end pixels of the links into the link position texture. Start and end pixel of a link are placed next to each other.
+
+    Args:
+        start (np.ndarray): (m,3) array of start pixels.
+        end (np.ndarray): (m,3) array of end pixels.
+        height (int, optional): height of the texture. Defaults to LINK_TEX_HEIGHT.
+
+    Returns:
+        np.ndarray: RGB plane with shape (height, 1024, 3) and dtype uint8.
+    """
+    texture = np.stack((start, end), axis=1).reshape(-1, 3)
+    return pad_texture(np.clip(texture, 0, 255), LINK_TEX_WIDTH, height)
+
+
+def encode_node_positions(
+    pos: np.ndarray, height: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Encodes node positions in the range of 0 to 1 into the high and low byte planes of the node textures.
+
+    Args:
+        pos (np.ndarray): (n,3) array of node positions.
+        height (int): height of the texture.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: high and low byte planes with shape (height, 128, 3) and dtype uint8.
+    """
+    scaled = (np.asarray(pos, dtype=np.float64) * POS_SCALE).astype(np.int64)
+    high = pad_texture(np.clip(scaled // 255, 0, 255), NODE_TEX_WIDTH, height)
+    low = pad_texture(np.clip(scaled % 255, 0, 255), NODE_TEX_WIDTH, height)
+    return high, low
+
+
+def decode_node_positions(high: np.ndarray, low: np.ndarray, n: int) -> np.ndarray:
+    """Decodes node positions from the high and low byte planes of the node textures. Inverse of encode_node_positions up to the resolution of the textures.
+
+    Args:
+        high (np.ndarray): high byte plane with shape (height, 128, 3).
+        low (np.ndarray): low byte plane with shape (height, 128, 3).
+        n (int): number of nodes.
+
+    Returns:
+        np.ndarray: (n,3) array of node positions in the range of 0 to 1.
+    """
+    high = np.asarray(high, dtype=np.float64).reshape(-1, 3)[:n]
+    low = np.asarray(low, dtype=np.float64).reshape(-1, 3)[:n]
+    return (high * 255 + low) / POS_SCALE
+
+
+def encode_colors(colors: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Encodes RGBA colors into a color texture.
+
+    Args:
+        colors (np.ndarray): (n,4) array of RGBA values.
+        width (int): width of the texture.
+        height (int): height of the texture.
+
+    Returns:
+        np.ndarray: RGBA plane with shape (height, width, 4) and dtype uint8.
+    """
+    return pad_texture(np.clip(colors, 0, 255), width, height)
+
+
+def pad_texture(values: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Writes row major pixel values into a zero initialized texture buffer. Values exceeding the texture are cut off.
+
+    Args:
+        values (np.ndarray): (n, channels) array of pixel values.
+        width (int): width of the texture.
+        height (int): height of the texture.
+
+    Returns:
+        np.ndarray: uint8 buffer with shape (height, width, channels).
+    """
+    channels = values.shape[1]
+    buffer = np.zeros((height * width, channels), dtype=np.uint8)
+    n = min(len(values), height * width)
+    buffer[:n] = values[:n]
+    return buffer.reshape(height, width, channels)
+
+
+def mask_textures(
+    textures: np.ndarray, selected: np.ndarray, color: tuple[int]
+) -> np.ndarray:
+    """Paints the pixels of all elements which are not selected in a stack of textures. Pixels beyond the number of elements are left untouched.
+
+    Args:
+        textures (np.ndarray): (k, height, width, channels) stack of textures, modified in place.
+        selected (np.ndarray): boolean vector which indicates for each element whether it is selected.
+        color (tuple[int]): color of the elements which are not selected.
+
+    Returns:
+        np.ndarray: the masked textures.
+    """
+    flat = textures.reshape(len(textures), -1, textures.shape[-1])
+    n = min(len(selected), flat.shape[1])
+    unselected = np.zeros(flat.shape[1], dtype=bool)
+    unselected[:n] = ~np.asarray(selected[:n], dtype=bool)
+    flat[:, unselected] = color
+    return textures
+
+
+def read_only(arr: np.ndarray) -> np.ndarray:
+    """Marks an array as read-only so it can safely be shared between threads.
+
+    Args:
+        arr (np.ndarray): array to share.
+
+    Returns:
+        np.ndarray: the same array, flagged as not writeable.
+    """
+    arr.setflags(write=False)
+    return arr
+
+
+def content_hash(*values) -> str:
+    """Hashes the input of a texture. Arrays are hashed by dtype, shape and content, object arrays (e.g. the raw color column of a DataFrame) by their pickled content and all other values by their representation. Missing inputs (None) are hashed as well, so the position of each value matters.
+
+    Args:
+        values: arrays and scalars the texture is generated from.
+
+    Returns:
+        str: hex digest of the input.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for value in values:
+        if isinstance(value, np.ndarray) and value.dtype == object:
+            h.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        elif isinstance(value, np.ndarray):
+            value = np.ascontiguousarray(value)
+            h.update(f"{value.dtype.str}{value.shape}".encode())
+            h.update(value.data)
+        else:
+            h.update(repr(value).encode())
+        h.update(b"|")
+    return h.hexdigest()
+
+
+def to_image(buffer: np.ndarray) -> Image.Image:
+    """Wraps a texture buffer into a PIL image. The mode (RGB or RGBA) is derived from the number of channels.
+
+    Args:
+        buffer (np.ndarray): uint8 buffer with shape (height, width, channels).
+
+    Returns:
+        Image.Image: RGB or RGBA image.
+    """
+    return Image.fromarray(np.ascontiguousarray(buffer))
@@ -0,0 +1,139 @@
+"""Local and global topology layouts for large graphs.
+
+The local and global layouts of cartoGRAPHs embed dense n×n matrices of the graph, the adjacency matrix and the random walk with restart matrix, with UMAP. Here, both matrices are replaced by low rank features computed from the sparse adjacency matrix:
+
+- local: truncated SVD of the row normalized adjacency matrix with self loops, i.e. of the neighborhood of every node.
+- global: the random walk with restart matrix restricted to the leading eigenvectors of the normalized adjacency matrix, a diffusion map.
+
+The k nearest neighbors of the features are computed in blocks of rows and handed to UMAP as precomputed_knn. Memory is O(d·n + m) for d features and m edges.
+"""
+
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+
+from . import feature_knn
+from .force_layout import _rescale, adjacency
+
+DENSE_NODES = 500  # Smaller graphs are decomposed with a dense solver
+FEATURES = 64  # Number of features per node
+RESTART = 0.15  # Restart probability of the random walk of the global features
+
+
+def local_features(A: sp.csr_matrix, d: int, rng: np.random.Generator) -> np.ndarray:
+    """Computes the truncated SVD of the row normalized adjacency matrix with self loops.
+
+    Args:
+        A (sp.csr_matrix): symmetric adjacency matrix.
+        d (int): number of features.
+        rng (np.random.Generator): random number generator for the start vector of the solver.
+
+    Returns:
+        np.ndarray: features with shape (n, d).
+    """
+    from scipy.sparse.linalg import svds
+
+    n = A.shape[0]
+    M = A + sp.identity(n, format="csr")
+    M = sp.diags(1 / np.asarray(M.sum(axis=1)).ravel()) @ M
+    if n <= DENSE_NODES or d >= n - 1:
+        U, S, _ = np.linalg.svd(M.toarray())
+        return U[:, :d] * S[:d]
+    U, S, _ = svds(M, k=d, v0=rng.random(n))
+    return U * S
+
+
+def global_features(
+    A: sp.csr_matrix, d: int, restart: float, rng: np.random.Generator
+) -> np.ndarray:
+    """Approximates the random walk with restart matrix with the d largest eigenvalues λ of the normalized adjacency matrix, the eigenvectors are weighted with restart / (1 - (1 - restart)·λ).
+
+    Args:
+        A (sp.csr_matrix): symmetric adjacency matrix.
+        d (int): number of features.
+        restart (float): restart probability of the random walk.
+        rng (np.random.Generator): random number generator for the start vector of the solver.
+
+    Returns:
+        np.ndarray: features with shape (n, d).
+    """
+    from scipy.sparse.linalg import ArpackNoConvergence, eigsh
+
+    n = A.shape[0]
+    degree = np.asarray(A.sum(axis=1)).ravel()
+    scale = 1 / np.sqrt(np.maximum(degree, 1e-12))
+    N = sp.diags(scale) @ A @ sp.diags(scale)
+    if n <= DENSE_NODES or d >= n - 1:
+        values, vectors = np.linalg.eigh(N.toarray())
+        order = np.argsort(values)[::-1][:d]
+        values, vectors = values[order], vectors[:, order]
+    else:
+        try:
+            values, vectors = eigsh(N, k=d, which="LA", tol=1e-4, v0=rng.random(n))
+        except ArpackNoConvergence as e:
+            values, vectors = e.eigenvalues, e.eigenvectors
+    weight = restart / (1 - (1 - restart) * values)
+    return scale[:, None] * vectors * weight
+
+
+def topology_layout(
+    G: nx.Graph,
+    features: str = "local",
+    n_neighbors: int = 10,
+    spread: float = 1.0,
+    min_dist: float = 0.1,
+    components: int = FEATURES,
+    dim: int = 3,
+    seed: int = None,
+) -> dict:
+    """Positions the nodes of a graph by embedding their local or global topology features with UMAP. Edge weights are taken from the "weight" attribute, they default to 1.
+
+    Args:
+        G (nx.Graph): graph to lay out.
+        features (str, optional): "local" or "global", see local_features and global_features. Defaults to "local".
+        n_neighbors (int, optional): size of the local neighborhood of UMAP. Defaults to 10.
+        spread (float, optional): scale of the embedded points. Defaults to 1.0.
+        min_dist (float, optional): minimal distance between the embedded points. Defaults to 0.1.
+        components (int, optional): number of features per node. Defaults to FEATURES.
+        dim (int, optional): dimension of the layout. Defaults to 3.
+        seed (int, optional): seed of the start vectors of the solvers. Defaults to None.
+
+    Raises:
+        ValueError: If features is neither "local" nor "global".
+
+    Returns:
+        dict: node ids as keys and positions as values, centered at the origin and scaled to [-1, 1].
+    """
+    if features not in ("local", "global"):
+        raise ValueError(f"Unknown topology features: {features}.")
+    nodes, start, end, weight = adjacency(G)
+    n = len(nodes)
+    if n <= dim + 1:
+        # Too small for UMAP
+        pos = np.zeros((n, dim))
+        pos[:, 0] = np.arange(n)
+        return dict(zip(nodes, _rescale(pos)))
+
+    rng = np.random.default_rng(seed)
+    A = sp.coo_matrix((weight, (start, end)), shape=(n, n)).tocsr()
+    A = A + A.T
+    d = min(components, n - 2)
+    if features == "local":
+        X = local_features(A, d, rng)
+    else:
+        X = global_features(A, d, RESTART, rng)
+    knn = feature_knn.cosine_knn(np.asarray(nodes), X, n_neighbors)
+    pos = feature_knn.umap_embedding(
+        X, knn, dim, n_neighbors, spread, min_dist, metric="cosine"
+    )
+    return dict(zip(nodes, _rescale(pos)))
+
+
+def local_layout(G: nx.Graph, *args, **kwargs) -> dict:
+    """Topology layout with the local features, see topology_layout."""
+    return topology_layout(G, "local", *args, **kwargs)
+
+
+def global_layout(G: nx.Graph, *args, **kwargs) -> dict:
+    """Topology layout with the global features, see topology_layout."""
+    return topology_layout(G, "global", *args, **kwargs)
@@ -4,8 +4,10 @@ import pandas as pd
 import requests
 from project import Project
 
+from . import column_store
 from . import settings as st
 from .classes import Evidences
+from .util import write_json
 import os
 
 
@@ -49,8 +51,12 @@ def upload(data: dict, files: dict) -> None:
 
         project.nodes = {"nodes": nodes}
         project.links = {"links": links}
-        project.write_nodes()
-        project.write_links()
+        for name, records in [("nodes", nodes), ("links", links)]:
+            file = os.path.join(project.location, f"{name}.json")
+            write_json(file, {name: records})
+            column_store.write_table(
+                project.location, name, pd.DataFrame(records), file
+            )
         # for file in os.listdir(project.layouts_rgb_dir):
         #     if any(x in file for x in ignored_layout_rgb):
         #         os.remove(os.path.join(project.layouts_rgb_dir, file))
@@ -1,11 +1,11 @@
+import json
 import os
 import sys
 import warnings
-from multiprocessing import Manager, Pool, Process
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pandas as pd
-import swifter
 
 import uploader as main_uploader
 
@@ -13,11 +13,11 @@ from .settings import _WORKING_DIR
 
 sys.path.append(os.path.join(_WORKING_DIR, "..", ".."))
 
-from PIL import Image
-
 import GlobalData as GD
 from project import COLOR, DEFAULT_PFILE, NODE, Project
 
+from . import column_store as cs
+from . import texture_util as tu
 from .classes import Evidences as EV
 from .classes import LayoutTags as LT
 from .classes import LinkTags as LiT
@@ -25,12 +25,16 @@ from .classes import NodeTags as NT
 from .classes import ProjectTag as PT
 from .classes import StringTags as ST
 from .classes import VRNetzElements as VRNE
-from .settings import log
-from .util import clean_filename
+from .layout_result import LayoutResult
+from .settings import LINK_BUDGET, TEXTURE_WORKERS, log
+from .util import clean_filename, frame_to_records, link_file, write_json
 
 warnings.filterwarnings("ignore")
 
 
+TEXTURE_MANIFEST = "textures.json"
+
+
 def os_join(*args):
     return os.path.join(*args)
 
@@ -41,6 +45,9 @@ class Uploader:
     p_name (str): project name
     overwrite_project (bool, optional): Indicates whether to overwrite existing projects. Defaults to False.
     stringify (bool, optional): Is used to reflect STRING features, if the network is a string network. Defaults to True.
+    n_workers (int, optional): Number of threads used to encode and write textures. Defaults to settings.TEXTURE_WORKERS.
+    link_budget (int, optional): Maximal number of links written to the link textures. None keeps all links. Defaults to settings.LINK_BUDGET.
+    layouts (dict[str, LayoutResult], optional): Layouts generated by the Layouter with the name of their node column as keys, e.g. "3d_pos". Their position arrays are encoded directly instead of the list columns of the nodes. Defaults to None.
     """
 
     def __init__(
@@ -49,8 +56,12 @@ class Uploader:
         p_name: str,
         overwrite_project: bool = False,
         stringify: bool = True,
+        n_workers: int = None,
+        link_budget: int = LINK_BUDGET,
+        layouts: dict[str, LayoutResult] = None,
     ) -> None:
         self.network = network
+        self.layouts = layouts or {}  # generated layouts by node layout column
         self.project = Project(p_name)
         self.overwrite_project = overwrite_project  # boolean that indicates whether to skip existing project files or to update them
         self.stringify = (
@@ -65,7 +76,12 @@ class Uploader:
         if self.stringify:
             self.project.pfile["network"] = "string"
         self.project.pfile["network_type"] = "ppi"
-        self.MAX_NUM_LINKS = 262144
+        self.link_budget = link_budget
+        self.link_pages = {}
+        if n_workers is None:
+            n_workers = TEXTURE_WORKERS
+        self.n_workers = max(1, n_workers)
+        self.texture_manifest = self.read_texture_manifest()
         # TODO: PFILE IS WRONGLY WRITTEN LINKS AND LINKSRGB IS SWITCHED
 
     def makeProjectFolders(self) -> None:
@@ -77,61 +93,162 @@ class Uploader:
         log.debug(f"Successfully created directories in {rel_path}.", flush=True)
         log.debug(f"Full Path {self.project.location}.", flush=True)
 
+    def write_project_jsons(
+        self, nodes: pd.DataFrame = None, links: pd.DataFrame = None
+    ) -> None:
+        """Writes the pfile as well as the names, nodes and links of the project. The large files are written with util.write_json, which uses orjson if it is available. If the nodes and links are given as DataFrame, a columnar copy is written next to the JSON files (see column_store).
+
+        Args:
+            nodes (pd.DataFrame, optional): nodes of the project as written to nodes.json. Defaults to None.
+            links (pd.DataFrame, optional): links of the project as written to links.json. Defaults to None.
+        """
+        self.project.write_pfile()
+        tables = {"nodes": nodes, "links": links}
+        for name in ["names", "nodes", "links"]:
+            data = getattr(self.project, name)
+            if data is None:
+                continue
+            file = os_join(self.project.location, f"{name}.json")
+            write_json(file, data)
+            if name not in tables:
+                continue
+            if tables[name] is not None:
+                cs.write_table(self.project.location, name, tables[name], file)
+            else:
+                cs.remove_table(self.project.location, name)
+
+    def read_texture_manifest(self) -> dict:
+        """Reads the texture manifest of the project. The manifest maps every texture file (relative to the project folder) to the hash of the input it has been generated from.
+
+        Returns:
+            dict: texture file to content hash. Empty if the project has no manifest yet.
+        """
+        file = os_join(self.project.location, TEXTURE_MANIFEST)
+        if not os.path.exists(file):
+            return {}
+        try:
+            with open(file, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            log.warning(f"Could not read texture manifest {file}.")
+            return {}
+
+    def write_texture_manifest(self) -> None:
+        """Writes the texture manifest to the project folder."""
+        file = os_join(self.project.location, TEXTURE_MANIFEST)
+        with open(file, "w") as f:
+            json.dump(self.texture_manifest, f)
+
+    def texture_is_current(self, files: list[str], key: str) -> bool:
+        """Checks whether all texture files exist and have been generated from the input with the hash key.
+
+        Args:
+            files (list[str]): texture files relative to the project folder.
+            key (str): content hash of the current input.
+
+        Returns:
+            bool: True if the textures do not need to be generated again.
+        """
+        path = self.project.location
+        return all(
+            self.texture_manifest.get(file) == key
+            and os.path.exists(os_join(path, file))
+            for file in files
+        )
+
+    def set_texture_hash(self, files: list[str], key: str = None) -> None:
+        """Stores the content hash of freshly written textures in the manifest. If key is None, the files are removed from the manifest, e.g. because they have been modified by something else than the upload.
+
+        Args:
+            files (list[str]): texture files relative to the project folder.
+            key (str, optional): content hash of the input. Defaults to None.
+        """
+        for file in files:
+            if key is None:
+                self.texture_manifest.pop(file, None)
+            else:
+                self.texture_manifest[file] = key
+
+    def link_position_files(self, layouts: list[str], page: int = 0) -> list[str]:
+        """Names of the link position bitmaps of all link layouts on a page, relative to the project folder.
+
+        Args:
+            layouts (list[str]): names of the link layouts.
+            page (int, optional): Index of the texture page. Defaults to 0.
+
+        Returns:
+            list[str]: one file per layout.
+        """
+        return [
+            os_join(
+                "links", tu.page_name(f"{lay.replace('_col', '')}XYZ", page) + ".bmp"
+            )
+            for lay in layouts
+        ]
+
+    def link_color_file(self, layout: str, page: int = 0) -> str:
+        """Name of the link color bitmap of a link layout on a page, relative to the project folder.
+
+        Args:
+            layout (str): name of the link layout.
+            page (int, optional): Index of the texture page. Defaults to 0.
+
+        Returns:
+            str: the color file.
+        """
+        rgb = tu.page_name(f"{layout.replace('_col', '')}RGB", page)
+        return os_join("linksRGB", f"{rgb}.png")
+
     def handle_link_layout(
         self,
         layout: str,
-        all_colors: pd.DataFrame,
-        start: pd.Series,
-        end: pd.Series,
+        all_colors: pd.Series or np.ndarray,
         path: str,
         height: int,
+        has_positions: bool = True,
+        page: int = 0,
+        key: str = None,
     ) -> dict:
         """
-        Handle a respective link layout and generate the respective bitmaps.
+        Handle a respective link layout and generate the respective color bitmap. The position bitmap is shared between all link layouts and written by write_link_positions.
 
         Args:
             layout (str): layout name.
-            all_colors (pd.DataFrame): contains all colors for the links.
-            start (pd.Series): contains all start positions for the links.
-            end (pd.Series): contains all end positions for the links.
+            all_colors (pd.Series or np.ndarray): contains the colors of all links on this page, either as RGB(A) lists or as a (m,4) array converted by tu.colors_to_array.
             path (str): path to the project folder.
             height (int): height of the image.
+            has_positions (bool, optional): Whether a position bitmap exists for this layout. Defaults to True.
+            page (int, optional): Index of the texture page. Defaults to 0.
+            key (str, optional): Content hash of the raw colors of this page. If the bitmap has been generated from the same input, the colors are not converted at all. Defaults to the hash of the converted colors.
 
         Returns:
             dict: contains the status message and the names of the generated files.
 
         """
-        colors = all_colors[: self.MAX_NUM_LINKS].copy()
         layout_name = layout.replace("_col", "")
-        colors = colors.swifter.progress_bar(False).apply(
-            lambda x: x
-            if x != (0, 0, 0, 0)
-            and x != "<NA>"
-            and x != np.nan
-            and not isinstance(x, float)
-            else pd.NA
-        )
-        colors = colors.fillna(0)
-        image = Image.new("RGBA", (512, height))
-        rgb = f"{layout_name}RGB"
+        rgb = tu.page_name(f"{layout_name}RGB", page)
         xyz = None
-        image.putdata(colors)
-        image.save(os_join(path, "linksRGB", f"{rgb}.png"))
-
-        if start.any() or end.any():
-            start = start.fillna(0)
-            end = end.fillna(0)
+        files = [self.link_color_file(layout, page)]
+        colors = None
+        if key is None:
+            colors = tu.colors_to_array(
+                all_colors[: tu.LINKS_PER_PAGE], default_alpha=tu.DEFAULT_LINK_ALPHA
+            )
+            key = tu.content_hash(colors, height)
+        if not self.texture_is_current(files, key):
+            if colors is None:
+                colors = tu.colors_to_array(
+                    all_colors[: tu.LINKS_PER_PAGE],
+                    default_alpha=tu.DEFAULT_LINK_ALPHA,
+                )
+            plane = tu.encode_colors(colors, tu.LINK_RGB_TEX_WIDTH, height)
+            tu.to_image(plane).save(os_join(path, files[0]))
+            self.set_texture_hash(files, key)
+        else:
+            log.debug(f"Link colors of {rgb} are unchanged.")
 
-            # Cut data frame to max number of links
-
-            texture = pd.concat([start, end]).sort_index(kind="stable")[
-                : self.MAX_NUM_LINKS
-            ]  # sort the entries in an alternating fashion
-            texture = texture.to_numpy()
-            xyz = f"{layout_name}XYZ"
-            image = Image.new("RGB", (1024, height))
-            image.putdata(texture)
-            image.save(os_join(path, "links", f"{xyz}.bmp"))
+        if has_positions:
+            xyz = tu.page_name(f"{layout_name}XYZ", page)
 
         res = {
             "out": (
@@ -144,21 +261,70 @@ class Uploader:
         }
         return res
 
+    def write_link_positions(
+        self,
+        layouts: list[str],
+        start: np.ndarray,
+        end: np.ndarray,
+        path: str,
+        height: int,
+        page: int = 0,
+        key: str = None,
+    ) -> bool:
+        """Encodes the link position bitmap once and makes it available under the name of every link layout. As the link positions do not depend on the layout, the first file is hard linked to the names of the remaining layouts.
+
+        Args:
+            layouts (list[str]): names of the link layouts.
+            start (np.ndarray): (m,3) array containing the start pixels of the links on this page.
+            end (np.ndarray): (m,3) array containing the end pixels of the links on this page.
+            path (str): path to the project folder.
+            height (int): height of the image.
+            page (int, optional): Index of the texture page. Defaults to 0.
+            key (str, optional): Content hash of the raw start and end ids of this page. Defaults to the hash of the pixels.
+
+        Returns:
+            bool: True if a position bitmap has been written.
+        """
+        if len(layouts) == 0 or (len(start) == 0 and len(end) == 0):
+            return False
+        names = self.link_position_files(layouts, page)
+        if key is None:
+            key = tu.content_hash(start, end, height)
+        if self.texture_is_current(names, key):
+            log.debug(f"Link positions of page {page} are unchanged.")
+            return True
+        files = [os_join(path, name) for name in names]
+        for file in files:
+            # Never write into an existing file, it might be linked to others
+            if os.path.exists(file):
+                os.remove(file)
+
+        # Start and end pixels alternate
+        plane = tu.encode_link_positions(start, end, height)
+        tu.to_image(plane).save(files[0])
+        for file in files[1:]:
+            link_file(files[0], file)
+        self.set_texture_hash(names, key)
+        log.debug(f"Link positions written once for {len(files)} link layouts.")
+        return True
+
     def make_link_tex(
         self,
         links: dict,
         layouts: list,
-        return_dict: dict = None,
-        parallel: bool = False,
-    ) -> None or list[dict]:
-        """Generate a Link texture from a dictionary of edges.
+        executor: ThreadPoolExecutor = None,
+    ) -> list[dict]:
+        """Generate a Link texture from a dictionary of edges. If the network has more links than fit into a single texture, the links are split into pages of tu.LINKS_PER_PAGE links. Page p of a texture is named like the texture with the suffix "_p", the first page carries no suffix. The names of all pages are stored in self.link_pages.
+
+        The raw start and end ids and colors of every page are hashed before they are converted. Positions and colors whose pages are all unchanged are not converted at all.
 
         Args:
             links (dict): contains all links of the network.
             layouts (list): contains all layouts for which the output should be generated.
+            executor (ThreadPoolExecutor, optional): Thread pool to encode and write the textures with. Defaults to None.
 
         Returns:
-            str: status message to report the status of the execution.
+            list[dict]: status message and names of the generated files of the first page for each layout.
         """
         if not isinstance(links, pd.DataFrame):
             links = pd.DataFrame(links)
@@ -170,45 +336,154 @@ class Uploader:
         # filtered = links[[LiT.id, LiT.start, LiT.end]]
         # self.links[VRNE.links] += filtered.to_dict(orient="records")
         log.debug("Handling Links..")
-        height = 512
-        path = self.project.location
-
-        tmp = links.copy()
-        tmp["start_pix"] = links[LiT.start].apply(
-            lambda x: (x % 128, x // 128 % 128, x // 16384)
-            if not pd.isnull(x)
-            else (0, 0, 0)
-        )
-        tmp["end_pix"] = links[LiT.end].apply(
-            lambda x: (x % 128, x // 128 % 128, x // 16384)
-            if not pd.isnull(x)
-            else (0, 0, 0)
-        )
+        height = tu.LINK_TEX_HEIGHT
+        if self.link_budget is not None and len(links) > self.link_budget:
+            log.warning(
+                f"Network has {len(links)} links, only the first {self.link_budget} are used for the link textures."
+            )
+            links = links.iloc[: self.link_budget]
+
+        # Link positions are ordered by the link index, colors by their position
+        tmp = links
+        if not links.index.is_monotonic_increasing:
+            tmp = links.sort_index(kind="stable")
+        raw_start = tmp[LiT.start].to_numpy()
+        raw_end = tmp[LiT.end].to_numpy()
         path = self.project.location
         layouts = [c for c in links.columns if c.endswith("col")]
-        args = []
+        raw_colors = {lay: links[lay].to_numpy() for lay in layouts}
+        has_positions = len(layouts) > 0 and len(links) > 0
+        n_pages = tu.num_pages(len(links))
+        if n_pages > 1:
+            log.debug(f"Splitting {len(links)} links into {n_pages} texture pages.")
+        pages = [
+            (page * tu.LINKS_PER_PAGE, (page + 1) * tu.LINKS_PER_PAGE)
+            for page in range(n_pages)
+        ]
+        pos_keys = [
+            tu.content_hash(raw_start[lo:hi], raw_end[lo:hi], height)
+            for lo, hi in pages
+        ]
+        color_keys = {
+            lay: [tu.content_hash(raw_colors[lay][lo:hi], height) for lo, hi in pages]
+            for lay in layouts
+        }
+
+        # Convert only what has changed, the jobs only encode and write
+        start_pix = end_pix = None
+        if has_positions and not all(
+            self.texture_is_current(self.link_position_files(layouts, page), key)
+            for page, key in enumerate(pos_keys)
+        ):
+            start_pix = tu.read_only(tu.link_pixels(raw_start))
+            end_pix = tu.read_only(tu.link_pixels(raw_end))
+        colors = {}
         for lay in layouts:
-            layout = tmp[lay].copy()
-            args.append(
-                (
-                    lay,
-                    layout,
-                    tmp["start_pix"],
-                    tmp["end_pix"],
-                    path,
-                    height,
+            colors[lay] = raw_colors[lay]
+            if not all(
+                self.texture_is_current([self.link_color_file(lay, page)], key)
+                for page, key in enumerate(color_keys[lay])
+            ):
+                colors[lay] = tu.read_only(
+                    tu.colors_to_array(links[lay], default_alpha=tu.DEFAULT_LINK_ALPHA)
                 )
-            )
-        if parallel:
-            pool = Pool()
-            output = pool.starmap(self.handle_link_layout, args)
-            pool.close()
-            return_dict["links"] = output
-        else:
-            output = []
-            for arg in args:
-                output.append(self.handle_link_layout(*arg))
-            return output
+        jobs = []
+        for page, (lo, hi) in enumerate(pages):
+            if start_pix is not None:
+                jobs.append(
+                    (
+                        self.write_link_positions,
+                        (
+                            layouts,
+                            start_pix[lo:hi],
+                            end_pix[lo:hi],
+                            path,
+                            height,
+                            page,
+                            pos_keys[page],
+                        ),
+                    )
+                )
+            for lay in layouts:
+                jobs.append(
+                    (
+                        self.handle_link_layout,
+                        (
+                            lay,
+                            colors[lay][lo:hi],
+                            path,
+                            height,
+                            has_positions,
+                            page,
+                            color_keys[lay][page],
+                        ),
+                    )
+                )
+        res = self.run_texture_jobs(jobs, executor)
+        self.remove_stale_link_pages(layouts, n_pages)
+        self.link_pages = {}
+        for lay in layouts:
+            name = lay.replace("_col", "")
+            textures = [f"{name}XYZ"] if has_positions else []
+            for tex in textures + [f"{name}RGB"]:
+                self.link_pages[tex] = [tu.page_name(tex, p) for p in range(n_pages)]
+        return [r for r in res if isinstance(r, dict)][: len(layouts)]
+
+    def remove_stale_link_pages(self, layouts: list[str], n_pages: int) -> None:
+        """Removes the pages of the link textures which are left over from a previous upload of the project with more links, together with their entries in the texture manifest.
+
+        Args:
+            layouts (list[str]): names of the link layouts.
+            n_pages (int): number of pages of the current link textures.
+        """
+        path = self.project.location
+        for lay in layouts:
+            page = n_pages
+            while True:
+                files = self.link_position_files([lay], page) + [
+                    self.link_color_file(lay, page)
+                ]
+                stale = [
+                    file
+                    for file in files
+                    if file in self.texture_manifest
+                    or os.path.exists(os_join(path, file))
+                ]
+                if len(stale) == 0:
+                    break
+                for file in stale:
+                    if os.path.exists(os_join(path, file)):
+                        os.remove(os_join(path, file))
+                self.set_texture_hash(stale)
+                log.debug(f"Removed stale link texture pages {stale}.")
+                page += 1
+
+    def texture_executor(self) -> ThreadPoolExecutor:
+        """Creates the thread pool used to read, encode and write textures.
+
+        Returns:
+            ThreadPoolExecutor: thread pool with self.n_workers threads.
+        """
+        return ThreadPoolExecutor(
+            max_workers=self.n_workers, thread_name_prefix="StringEx_textures"
+        )
+
+    def run_texture_jobs(
+        self, jobs: list[tuple], executor: ThreadPoolExecutor = None
+    ) -> list:
+        """Runs texture jobs either directly or on a thread pool. Only the PIL encoders and the file writes release the GIL, so the jobs should do nothing else than encoding and writing, the conversion of the input into arrays is done before the jobs are submitted.
+
+        Args:
+            jobs (list[tuple]): list of (function, arguments) tuples.
+            executor (ThreadPoolExecutor, optional): Thread pool to run the jobs on. If None, jobs are executed one after another. Defaults to None.
+
+        Returns:
+            list: return values of the jobs in the order of the jobs.
+        """
+        if executor is None:
+            return [func(*args) for func, args in jobs]
+        futures = [executor.submit(func, *args) for func, args in jobs]
+        return [future.result() for future in futures]
 
     def stringify_project(self, links: bool = True, nodes: bool = True):
         """Only adds the evidences to pfile layouts.
@@ -232,14 +507,14 @@ class Uploader:
         self.project.write_pfile()
 
     def handle_node_layout(
-        self, layout: str, pos: pd.Series, color: pd.Series, path: str, hight: int
+        self, layout: str, pos: np.ndarray, color: np.ndarray, path: str, hight: int
     ) -> dict:
         """Handles the creation of a node layout.
 
         Args:
             layout (str): layout name.
-            pos (pd.Series): coordinates of the nodes.
-            color (pd.Series): color of the nodes.
+            pos (np.ndarray): (n,3) array of node coordinates.
+            color (np.ndarray): (n,4) array of node colors.
             path (str): path to the project folder.
             hight (int): hight of the image.
 
@@ -249,55 +524,31 @@ class Uploader:
         layout_name = layout.replace("_pos", "")
         xyz = None
         rgb = None
-        if pos is not None and pos.any():
-            pos = pos.swifter.progress_bar(False).apply(
-                lambda x: [int(float(value) * 65280) for value in x]
-            )
-
-            t_high = (
-                pos.swifter.progress_bar(False)
-                .apply(lambda x: tuple(value // 255 for value in x))
-                .fillna(0)
-            )
-            t_low = (
-                pos.swifter.progress_bar(False)
-                .apply(lambda x: tuple(value % 255 for value in x))
-                .fillna(0)
-            )
-
-            images = {k: Image.new("RGB", (128, hight)) for k in ["high", "low"]}
-            images["layoutsRGB"] = Image.new("RGBA", (128, hight))
-
-            for key, data in zip(["high", "low"], [t_high, t_low]):
-                images[key].putdata(data)
-            images["high"]
-
+        if pos is not None and len(pos) > 0:
             xyz = f"{layout_name}XYZ"
-            images["high"].save(os_join(path, "layouts", f"{xyz}.bmp"))
-            images["low"].save(os_join(path, "layoutsl", f"{xyz}l.bmp"))
-
-        if color is not None and color.any():
-            color = color.fillna(0)
-
-            def set_color(x):
-                if len(x) == 4:
-                    return tuple(
-                        x,
-                    )
-                elif x == 0:
-                    return x
-                return tuple(
-                    x
-                    + [
-                        255 // 2,
-                    ],
-                )
-
-            color = color.swifter.progress_bar(False).apply(set_color)
-            images["layoutsRGB"].putdata(color)
+            files = [
+                os_join("layouts", f"{xyz}.bmp"),
+                os_join("layoutsl", f"{xyz}l.bmp"),
+            ]
+            key = tu.content_hash(pos, hight)
+            if not self.texture_is_current(files, key):
+                high, low = tu.encode_node_positions(pos, hight)
+                tu.to_image(high).save(os_join(path, files[0]))
+                tu.to_image(low).save(os_join(path, files[1]))
+                self.set_texture_hash(files, key)
+            else:
+                log.debug(f"Node positions of {layout_name} are unchanged.")
 
+        if color is not None and len(color) > 0:
             rgb = f"{layout_name}RGB"
-            images["layoutsRGB"].save(os_join(path, "layoutsRGB", f"{rgb}.png"))
+            files = [os_join("layoutsRGB", f"{rgb}.png")]
+            key = tu.content_hash(color, hight)
+            if not self.texture_is_current(files, key):
+                plane = tu.encode_colors(color, tu.NODE_TEX_WIDTH, hight)
+                tu.to_image(plane).save(os_join(path, files[0]))
+                self.set_texture_hash(files, key)
+            else:
+                log.debug(f"Node colors of {layout_name} are unchanged.")
 
         res = {
             "out": '<br><a style="color:green;">SUCCESS </a>'
@@ -313,15 +564,18 @@ class Uploader:
         nodes: list[dict],
         layouts: list[str],
         skip_attr: list[str] = ["layouts"],
-        return_dict: dict = None,
-        parallel: bool = False,
-    ) -> None or list[dict]:
+        executor: ThreadPoolExecutor = None,
+    ) -> list[dict]:
         """Extract all Node data from the network.
 
         Args:
             nodes (list[dict]): Contains all nodes of the network as key, value pairs.
             skip_attr (list[str]): Contains all attributes that should be skipped.
             layouts (list[str]): Contains all layouts for which positions should be extracted.
+            executor (ThreadPoolExecutor, optional): Thread pool to encode and write the textures with. Defaults to None.
+
+        Returns:
+            list[dict]: status message and names of the generated files for each layout.
         """
         if not isinstance(nodes, pd.DataFrame):
             nodes = pd.DataFrame(nodes)
@@ -329,7 +583,7 @@ class Uploader:
         # filtered = nodes.drop(columns=skip_attr)
         # self.nodes[VRNE.nodes] += filtered.to_dict(orient="records")
         n = len(nodes)
-        hight = 128 * (int(n / 16384) + 1)
+        hight = tu.node_texture_height(n)
 
         path = self.project.location
         layouts = [c for c in nodes.columns if c.endswith("_pos")]
@@ -340,17 +594,19 @@ class Uploader:
         args = []
 
         for idx in range(n):
+            layout, lay, color = None, None, None
             if idx < len(layouts):
                 lay = layouts[idx]
-                layout = nodes[lay].copy()
-            else:
-                layout = None
-                lay = None
-            if idx < len(colors):
-                color = colors[idx]
-                color = nodes[color].copy()
-            else:
-                color = None
+                if lay in self.layouts:
+                    # Use the arrays of the layouter instead of the list column
+                    pos = self.layouts[lay].positions(nodes.index)
+                    layout = tu.read_only(
+                        np.nan_to_num(tu.positions_to_array(pos), nan=0.0)
+                    )
+                elif nodes[lay].any():
+                    layout = tu.read_only(tu.positions_to_array(nodes[lay]))
+            if idx < len(colors) and nodes[colors[idx]].any():
+                color = tu.read_only(tu.colors_to_array(nodes[colors[idx]]))
             args.append(
                 (
                     lay,
@@ -360,20 +616,8 @@ class Uploader:
                     hight,
                 )
             )
-        if parallel:
-            n = len(layouts)
-            pool = Pool(n)
-            output = pool.starmap(
-                self.handle_node_layout,
-                args,
-            )
-            pool.close()
-            return_dict["nodes"] = output
-        else:
-            output = []
-            for arg in args:
-                output.append(self.handle_node_layout(*arg))
-            return output
+        jobs = [(self.handle_node_layout, arg) for arg in args]
+        return self.run_texture_jobs(jobs, executor)
 
     def upload_files(
         self,
@@ -418,13 +662,14 @@ class Uploader:
             self.project.names[NT.display_name] = [
                 [n] for n in nodes[NT.display_name].tolist()
             ]
-        if parallel:
+        if parallel and self.n_workers > 1:
             node_tex_res, link_tex_res = self.parallel_process(
                 nodes, links, n_lay, l_lay
             )
         else:
             node_tex_res = self.make_node_tex(nodes, n_lay)
             link_tex_res = self.make_link_tex(links, l_lay)
+        self.write_texture_manifest()
         state = ""
         for res in node_tex_res:
             state += res["out"]
@@ -439,6 +684,7 @@ class Uploader:
                 self.project.pfile["links"].append(res["xyz"])
             if res["rgb"] and res["rgb"] not in self.project.pfile["linksRGB"]:
                 self.project.pfile["linksRGB"].append(res["rgb"])
+        self.project.pfile[PT.link_pages] = self.link_pages
         nodes = self.network.get(VRNE.nodes, [])
 
         if isinstance(nodes, pd.DataFrame):
@@ -479,13 +725,9 @@ class Uploader:
         if "stringdb_description" in nodes.columns:
             nodes = nodes.rename(columns={"stringdb_description": "description"})
         nodes = nodes.rename(columns={"string": "name"})
-        self.project.nodes = {
-            "nodes": [v.dropna().to_dict() for k, v in nodes.iterrows()]
-        }
-        self.project.links = {
-            "links": [v.dropna().to_dict() for k, v in links.iterrows()]
-        }
-        self.project.write_all_jsons()
+        self.project.nodes = {"nodes": frame_to_records(nodes)}
+        self.project.links = {"links": frame_to_records(links)}
+        self.write_project_jsons(nodes, links)
         if self.stringify:
             self.stringify_project()
 
@@ -501,6 +743,7 @@ class Uploader:
         target_project: str,
         update_link_textures: bool = True,
         skip_attr=["layouts"],
+        parallel: bool = True,
     ):
         """Will color all node in the target project to the color of the corresponding node in the source project to reflect the mapped nodes.
         Node which are not mapped will be colored in the mapping color and will glow less.
@@ -508,8 +751,11 @@ class Uploader:
         Args:
             target_project (str): name of the target project
             mapping_color (list[int], optional): color (RGB) of not mapped nodes. Defaults to [255, 255, 255].
+            parallel (bool, optional): Whether to read and write the color textures on a thread pool. Defaults to True.
         """
-        self.project.read_all_jsons()
+        # Nodes and links are taken from the network, no need to parse them
+        self.project.read_pfile()
+        self.project.read_names()
         target_links = self.project.get_pfile_value(PT.links)
         target_links_rgb = self.project.get_pfile_value(PT.links_rgb)
 
@@ -546,100 +792,84 @@ class Uploader:
         nodes.update(mapped_nodes)
         nodes.update(not_mappend)
 
-        self.project.nodes = {
-            "nodes": [
-                {
-                    k: v
-                    for k, v in m.items()
-                    if pd.api.types.is_list_like(v) or pd.notnull(v)
-                }
-                for m in nodes.to_dict(orient="rows")
-            ]
-        }
+        self.project.nodes = {"nodes": frame_to_records(nodes)}
 
         self.project.links = {"links": []}
         links = self.network.get(VRNE.links)
 
-        self.project.links = {
-            "links": [
-                {
-                    k: v
-                    for k, v in m.items()
-                    if pd.api.types.is_list_like(v) or pd.notnull(v)
-                }
-                for m in links.to_dict(orient="rows")
-            ]
-        }
+        links = pd.DataFrame(links)
+        self.project.links = {"links": frame_to_records(links)}
+        json_nodes, json_links = nodes, links
 
         nodes = nodes.drop(
-            columns=[c for c in nodes.columns if c not in [NT.node_color, NT.size]]
+            columns=[
+                c for c in nodes.columns if c not in [NT.id, NT.node_color, NT.size]
+            ]
         )
 
-        def mask_nodes(project: Project, nodes: pd.DataFrame, selected_nodes: list):
-            # MASK WHICH HIGHLIGHTS NODES THAT ARE SELECTED
-            NODE_BITMAP_SIZE = 128
-            nodes = pd.DataFrame(project.get_nodes()["nodes"])
-            mask = np.zeros((NODE_BITMAP_SIZE, NODE_BITMAP_SIZE, 4))
-            nodes = nodes[nodes["id"].isin(selected_nodes)].copy()
-            x, y = nodes["id"] // NODE_BITMAP_SIZE, nodes["id"] % NODE_BITMAP_SIZE
-            x, y = x.astype(int), y.astype(int)
-            mask[x, y, :] = 1
-            return mask
-
-        mask = mask_nodes(self.project, nodes, mapped_nodes.index)
-        for lay in layouts:
-            layout_bmp = self.project.load_bitmap(lay, NODE, COLOR, True)
-            selected = np.zeros_like(layout_bmp)
-            selected[layout_bmp > 0] = mask[layout_bmp > 0]
-            # Multiply the two images element-wise
-            if len(np.unique(layout_bmp)) >= 1:
-                # If not all colors are the same, use the color of the selected nodes.
-                result = layout_bmp * selected
-            else:
-                # Else mask selected nodes red.
-                result[:, :, :3] = [255, 0, 0]
-
-            non_zero = np.nonzero(selected)
-            NOT_SELECTED = (
-                255,
-                255,
-                255,
-                10,
-            )
-            max_row = np.max(non_zero[0])
-            non_zero = np.nonzero(selected[max_row])
-            max_col = np.max(non_zero[0])
-            not_selected = ~selected
-            not_selected[:max_row, :, :] = NOT_SELECTED
-            not_selected[max_row, :max_col, :] = NOT_SELECTED
-            not_selected[max_row, max_col:, :] = NOT_SELECTED
-            not_selected[max_row + 1 :, :, :] = NOT_SELECTED
-
-            result = result + not_selected
-            bmp = Image.fromarray(np.uint8(result))
-            self.project.write_bitmap(bmp, lay, NODE, COLOR)
+        # Pixel of each node is given by its id
+        selected = np.zeros(len(nodes), dtype=bool)
+        ids = nodes.loc[nodes[NT.id].isin(mapped_nodes.index), NT.id].astype(int)
+        selected[ids[ids < len(nodes)]] = True
 
         # color layout which just highlights the mapped nodes
-        mapped_nodes[NT.node_color] = mapped_nodes.swifter.progress_bar(False).apply(
-            lambda x: tuple(x[NT.node_color] + [int(255 * x[NT.size])]), axis=1
+        is_mapped = nodes[NT.size].notna().to_numpy()
+        colors = tu.colors_to_array(nodes[NT.node_color])
+        colors[:, 3] = np.where(
+            is_mapped,
+            np.clip(255 * nodes[NT.size].fillna(0).to_numpy(), 0, 255).astype(int),
+            50,
         )
-
-        not_mappend[NT.node_color] = (
-            not_mappend[NT.node_color]
-            .swifter.progress_bar(False)
-            .apply(lambda x: tuple(x + [50]))
+        plane = tu.encode_colors(
+            colors, tu.NODE_TEX_WIDTH, tu.node_texture_height(len(nodes))
         )
-        nodes = pd.concat([mapped_nodes, not_mappend])
-        nodes = nodes.sort_index()
-        layout_bmp = Image.new("RGBA", (128, 128))
-        layout_bmp.putdata(nodes[NT.node_color])
-        self.project.write_bitmap(layout_bmp, "Mapped", NODE, COLOR)
+
+        if parallel and self.n_workers > 1:
+            with self.texture_executor() as executor:
+                self.mask_node_colors(layouts, selected, executor)
+        else:
+            self.mask_node_colors(layouts, selected)
+        self.project.write_bitmap(tu.to_image(plane), "Mapped", NODE, COLOR)
+        self.set_texture_hash([os_join("layoutsRGB", "Mapped.png")])
+        self.write_texture_manifest()
         self.project.add_node_color("Mapped")
 
-        self.project.write_all_jsons()
+        self.write_project_jsons(json_nodes, json_links)
+
+    def mask_node_colors(
+        self,
+        layouts: list[str],
+        selected: np.ndarray,
+        executor: ThreadPoolExecutor = None,
+        color: tuple[int] = tu.NOT_SELECTED_COLOR,
+    ) -> None:
+        """Highlights the selected nodes in all given node color textures. Pixels of nodes which are not selected are set to color, selected nodes keep their color. Textures of the same size are masked together in a single operation.
+
+        Args:
+            layouts (list[str]): names of the node color textures.
+            selected (np.ndarray): boolean vector which indicates for each node whether it is selected.
+            executor (ThreadPoolExecutor, optional): Thread pool to read and write the textures with. Defaults to None.
+            color (tuple[int], optional): RGBA color of the nodes which are not selected. Defaults to tu.NOT_SELECTED_COLOR.
+        """
+        jobs = [(self.project.load_bitmap, (lay, NODE, COLOR, True)) for lay in layouts]
+        bitmaps = dict(zip(layouts, self.run_texture_jobs(jobs, executor)))
+        groups = {}
+        for lay, bmp in bitmaps.items():
+            groups.setdefault(bmp.shape, []).append(lay)
+        jobs = []
+        for shape, names in groups.items():
+            stack = np.stack([bitmaps[name] for name in names])
+            stack = tu.mask_textures(stack, selected, color[: shape[-1]])
+            for name, bmp in zip(names, stack):
+                jobs.append(
+                    (self.project.write_bitmap, (tu.to_image(bmp), name, NODE, COLOR))
+                )
+                self.set_texture_hash([os_join("layoutsRGB", f"{name}.png")])
+        self.run_texture_jobs(jobs, executor)
 
     def update_link_textures(self, links, l_lay, target_links, target_links_rgb):
         self.make_link_tex(links, l_lay)
+        self.write_texture_manifest()
         self.stringify_project(nodes=False)
         self.project.pfile[PT.links] += [
             link for link in target_links if "stringdb" not in link
@@ -668,43 +898,26 @@ class Uploader:
                 nodes.rename(columns={s_attr: u_att}, inplace=True)
         return nodes
 
-    def parallel_process(self, nodes, links, n_lay, l_lay):
-        manager = Manager()
-        return_dict = manager.dict()
-        processes = []
-        if len(n_lay) > os.cpu_count():
-            log.debug("Parallel node layout creation", flush=True)
-            np = Process(
-                target=self.make_node_tex,
-                args=(
-                    nodes,
-                    n_lay,
-                ),
-                kwargs={"return_dict": return_dict, "parallel": True},
-            )
-            processes.append(np)
-        else:
-            return_dict["nodes"] = self.make_node_tex(nodes, n_lay)
-        if len(l_lay) > os.cpu_count():
-            log.debug("Parallel link layout Creation", flush=True)
-            lp = Process(
-                target=self.make_link_tex,
-                args=(
-                    links,
-                    l_lay,
-                ),
-                kwargs={"return_dict": return_dict, "parallel": True},
-            )
-            processes.append(lp)
-        else:
-            return_dict["links"] = self.make_link_tex(links, l_lay)
-
-        for p in processes:
-            p.start()
+    def parallel_process(
+        self,
+        nodes: pd.DataFrame,
+        links: pd.DataFrame,
+        n_lay: list[str],
+        l_lay: list[str],
+    ) -> tuple[list[dict], list[dict]]:
+        """Encodes and writes all node and link textures on a shared thread pool. The network data is prepared once as read-only arrays which are shared by all threads.
 
-        for p in processes:
-            p.join()
+        Args:
+            nodes (pd.DataFrame): nodes of the network.
+            links (pd.DataFrame): links of the network.
+            n_lay (list[str]): node layouts of the network.
+            l_lay (list[str]): link layouts of the network.
 
-        node_tex_res = return_dict["nodes"]
-        link_tex_res = return_dict["links"]
+        Returns:
+            tuple[list[dict], list[dict]]: results of the node textures and the link textures.
+        """
+        log.debug(f"Creating textures with {self.n_workers} threads", flush=True)
+        with self.texture_executor() as executor:
+            node_tex_res = self.make_node_tex(nodes, n_lay, executor=executor)
+            link_tex_res = self.make_link_tex(links, l_lay, executor=executor)
         return node_tex_res, link_tex_res
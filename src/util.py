@@ -3,15 +3,18 @@ import json
 import os
 import shutil
 
-import swifter
-
 try:
     import GlobalData as GD
 except ModuleNotFoundError:
     pass
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
 import random
 
 import networkx as nx
+import numpy as np
 import pandas as pd
 from PIL import Image
 
@@ -31,32 +34,76 @@ def get_algo_variables(algo: str, form: dict) -> dict:
         form (dict): dictionary containing all form elements.
 
     Returns:
-        dict: dictionary of the needed variables for the picked algorithm.
+        dict: dictionary of the needed variables for the picked algorithm. The keys "per_component", "warm_start", "spectral_init" and "time_budget_s" are set for all algorithms, "time_budget_s" is None if no budget is given.
     """
     if algo is None:
         return algo
+    variables = {
+        "per_component": bool(form.get("string_per_component", False)),
+        "warm_start": bool(form.get("string_warm_start", False)),
+        "spectral_init": bool(form.get("string_spectral_init", False)),
+        "time_budget_s": parse_time_budget(form.get("string_time_budget")),
+    }
     if "cg" in algo:
-        return {
-            "prplxty": form.get("string_cg_prplxty", 50),
-            "density": form.get("string_cg_density", 12),
-            "l_rate": form.get("string_cg_l_rate", 200),
-            "steps": form.get("string_cg_steps", 250),
-            "n_neighbors": form.get("string_cg_n_neighbors", 10),
-            "spread": form.get("string_cg_spread", 1.0),
-            "min_dist": form.get("string_cg_min_dist", 0.1),
-        }
-    if algo == LayoutAlgorithms.spring:
+        variables.update(
+            {
+                "prplxty": form.get("string_cg_prplxty", 50),
+                "density": form.get("string_cg_density", 12),
+                "l_rate": form.get("string_cg_l_rate", 200),
+                "steps": form.get("string_cg_steps", 250),
+                "n_neighbors": form.get("string_cg_n_neighbors", 10),
+                "spread": form.get("string_cg_spread", 1.0),
+                "min_dist": form.get("string_cg_min_dist", 0.1),
+            }
+        )
+    elif algo in [
+        LayoutAlgorithms.spring,
+        LayoutAlgorithms.barnes_hut,
+        LayoutAlgorithms.multilevel,
+    ]:
         opt_dist = form.get("string_spring_opt_dist", 0.0)
         if opt_dist == 0:
             opt_dist = None
 
-        return {
-            "opt_dist": opt_dist,
-            "iterations": form.get("string_spring_iterations", 50),
-            "threshold": form.get("string_spring_threshold", 0.0001),
-        }
-    else:
-        return {}
+        variables.update(
+            {
+                "opt_dist": opt_dist,
+                "iterations": form.get("string_spring_iterations", 50),
+                "threshold": form.get("string_spring_threshold", 0.0001),
+            }
+        )
+    elif algo == LayoutAlgorithms.stress:
+        variables.update(
+            {
+                "pivots": form.get("string_stress_pivots", 50),
+                "iterations": form.get("string_stress_iterations", 100),
+            }
+        )
+    return variables
+
+
+def parse_time_budget(value: str or float) -> float:
+    """Parses the time budget of a layout. Empty values and 0 mean that there is no budget, non numeric and negative values are rejected with a warning.
+
+    Args:
+        value (str or float): time budget in seconds, e.g. the value of the upload form.
+
+    Returns:
+        float: the time budget in seconds or None if there is no valid budget.
+    """
+    if value is None or value == "":
+        return None
+    try:
+        budget = float(value)
+    except (TypeError, ValueError):
+        log.warning(f"Ignoring the time budget {value!r}, it is not a number.")
+        return None
+    if not np.isfinite(budget) or budget < 0:
+        log.warning(
+            f"Ignoring the time budget {value!r}, it has to be a positive number."
+        )
+        return None
+    return budget or None
 
 
 def prepare_networkx_network(G: nx.Graph, positions: dict = None) -> tuple[dict, dict]:
@@ -126,6 +173,72 @@ def clean_filename(name: str) -> str:
     return name
 
 
+def link_file(src: str, dst: str) -> None:
+    """Makes the file src available at dst. A hard link is created if the file system supports it, otherwise the file is copied.
+
+    Args:
+        src (str): path of the existing file.
+        dst (str): path under which the file should be available.
+    """
+    if os.path.exists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def frame_to_records(df: pd.DataFrame) -> list[dict]:
+    """Converts a DataFrame into a list of records in which missing values are dropped. Equivalent to [row.dropna().to_dict() for _, row in df.iterrows()], but works column by column and keeps the dtype of each column, so integer columns stay integers.
+
+    Args:
+        df (pd.DataFrame): DataFrame to convert.
+
+    Returns:
+        list[dict]: one dictionary per row containing all non missing values.
+    """
+    records = [{} for _ in range(len(df))]
+    for col in df.columns:
+        values = df[col].tolist()
+        valid = df[col].notna().to_numpy()
+        if valid.all():
+            for record, value in zip(records, values):
+                record[col] = value
+        else:
+            for record, value, keep in zip(records, values, valid):
+                if keep:
+                    record[col] = value
+    return records
+
+
+def _json_default(obj):
+    """Converts NumPy objects which are not serializable by the json module."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def write_json(file: str, data: dict) -> None:
+    """Writes data to a JSON file. If orjson is installed, it is used to serialize the data, otherwise the data is streamed to the file with the json module.
+
+    Args:
+        file (str): path of the JSON file.
+        data (dict): data to write.
+    """
+    if orjson is not None:
+        with open(file, "wb") as f:
+            f.write(
+                orjson.dumps(
+                    data, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY
+                )
+            )
+        return
+    with open(file, "w") as f:
+        json.dump(data, f, default=_json_default)
+
+
 def pepare_uploader() -> None:
     """Adds extension specific data to GD.sessionData."""
     strinEx_config = {}
@@ -7,13 +7,19 @@ import time
 import traceback
 
 import flask
+import numpy as np
 import pandas as pd
+from PIL import Image
 
 from project import Project
 
+from . import column_store
+from . import texture_util as tu
 from . import util as string_util
 from .classes import Evidences
+from .classes import LayoutTags as LT
 from .classes import LinkTags as LiT
+from .classes import NodeTags as NT
 from .classes import Organisms
 from .classes import VRNetzElements as VRNE
 from .layouter import Layouter
@@ -70,6 +76,9 @@ def VRNetzer_upload_workflow(
     # create layout
     log.info(f"Applying layout algorithm:{algo}", flush=True)
     s1 = time.time()
+    init_pos = None
+    if algo_variables.get("warm_start") and not overwrite_project:
+        init_pos = read_project_layout(project_name, layout_name or "3d")
     layouter = apply_layout_workflow(
         network,
         layout_algo=algo,
@@ -77,6 +86,7 @@ def VRNetzer_upload_workflow(
         gen_layout=tags.get("string_calc_lay"),
         algo_variables=algo_variables,
         layout_name=layout_name,
+        init_pos=init_pos,
     )
     log.debug(f"Applying layout algorithm in {time.time()-s1} seconds.")
     log.info(f"Applied layout algorithm:{algo}", flush=True)
@@ -87,6 +97,7 @@ def VRNetzer_upload_workflow(
         p_name=project_name,
         stringify=tags.get("stringify"),
         overwrite_project=overwrite_project,
+        layouts=layouter.layouts,
     )
     s1 = time.time()
     state = uploader.upload_files(network)
@@ -248,6 +259,7 @@ def apply_layout_workflow(
     stringify: bool = True,
     algo_variables: dict = {},
     layout_name: str = None,
+    init_pos: dict = None,
 ) -> Layouter:
     """
     Applies a layout algorithm to a network and returns a Layouter object.
@@ -259,6 +271,7 @@ def apply_layout_workflow(
         stringify (bool, optional): Indicates whether the network is a STRING network. Defaults to True.
         algo_variables (dict, optional): Dictionary containing the parameters of the layout algorithm. Defaults to {}.
         layout_name (str, optional): Name of the layout. Defaults to None.
+        init_pos (dict, optional): Existing node positions with node names as keys, e.g. the layout of the project which is updated. Only used if the algorithm variable "warm_start" is set. If not given, the Cytoscape coordinates of the network are used for the warm start. Defaults to None.
     """
     layouter = Layouter()
     if type(network) is dict:
@@ -274,12 +287,23 @@ def apply_layout_workflow(
         if layout_algo is None:
             layout_algo = "spring"
         log.info(f"Applying algorithm {layout_algo} ...")
-        layout = layouter.apply_layout(layout_algo, algo_variables)
+        init = None
+        if (algo_variables or {}).get("warm_start"):
+            init = existing_positions(layouter.network[VRNE.nodes], init_pos)
+            log.info(f"Warm start from {len(init)} existing node positions.")
+        layout = layouter.apply_layout(layout_algo, algo_variables, init_pos=init)
+        log.info(
+            f"Layout cache: {layouter.cache_hits} hit(s), {layouter.cache_misses} miss(es)."
+        )
         algo, layout = next(iter(layout.items()))
         nodes = layouter.add_layout_to_vrnetz(
             layouter.network[VRNE.nodes], layout, layout_name
         )
         layouter.network[VRNE.nodes] = nodes
+        layouter.layouts = {
+            f"{layout_name}_pos": layout,
+            f"{layout_name}2d_pos": layout.without_z(),
+        }
         log.info(f"Layout algorithm {layout_algo} applied!")
     links = Layouter.gen_evidence_layouts(
         layouter.network[VRNE.links], stringify=stringify
@@ -290,3 +314,61 @@ def apply_layout_workflow(
             links = links.drop(columns=[c])
     layouter.network[VRNE.links] = links
     return layouter
+
+
+def existing_positions(nodes: pd.DataFrame, positions: dict = None) -> dict:
+    """Collects existing positions of the nodes to warm start a layout.
+
+    Args:
+        nodes (pd.DataFrame): Nodes of the network.
+        positions (dict, optional): Node names as keys and positions as values. Nodes are matched by their name, nodes without a name column get no positions. If not given, the Cytoscape coordinates of the nodes are used. Defaults to None.
+
+    Returns:
+        dict: Node ids (index of nodes) as keys and three dimensional positions as values. Nodes without a position are left out.
+    """
+    if positions:
+        if NT.name not in nodes:
+            return {}
+        pos = nodes[NT.name].map(positions)
+    elif "cy_pos" in nodes:
+        pos = nodes["cy_pos"]
+    elif NT.layouts in nodes:
+        pos = nodes[NT.layouts].map(
+            lambda x: x[0].get(LT.position) if isinstance(x, list) and x else None
+        )
+    else:
+        return {}
+    init = {}
+    for idx, p in pos.items():
+        if not pd.api.types.is_list_like(p) or len(p) < 2:
+            continue
+        p = np.asarray(p, dtype=float)[:3]
+        init[idx] = np.pad(p, (0, 3 - len(p)))
+    return init
+
+
+def read_project_layout(project_name: str, layout_name: str) -> dict or None:
+    """Reads the node positions of a layout from the textures of an existing project.
+
+    Args:
+        project_name (str): Name of the project.
+        layout_name (str): Name of the node layout, without the "_pos" suffix.
+
+    Returns:
+        dict or None: Node names as keys and positions in the range of 0 to 1 as values. None if the project or the layout does not exist.
+    """
+    project = Project(project_name, read=False)
+    high_file = os.path.join(project.location, "layouts", f"{layout_name}XYZ.bmp")
+    low_file = os.path.join(project.location, "layoutsl", f"{layout_name}XYZl.bmp")
+    if not (os.path.exists(high_file) and os.path.exists(low_file)):
+        return None
+    names = column_store.read_column(project.location, "nodes", NT.name)
+    if names is None:
+        project.read_nodes()
+        names = [node.get(NT.name) for node in project.nodes["nodes"]]
+    with Image.open(high_file) as high, Image.open(low_file) as low:
+        pos = tu.decode_node_positions(
+            np.asarray(high.convert("RGB")), np.asarray(low.convert("RGB")), len(names)
+        )
+    log.debug(f"Read {len(names)} node positions of {layout_name} from {project_name}.")
+    return dict(zip(names, pos))
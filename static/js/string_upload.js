@@ -25,26 +25,41 @@ $(document).ready(function () {
       document.getElementById("string_cg_umap").style.display = "none";
       document.getElementById("string_spring").style.display = "none";
       document.getElementById("string_kamada_kawai").style.display = "none";
+      document.getElementById("string_stress").style.display = "none";
     } else if (name.includes("umap")) {
       document.getElementById("string_cg_umap").style.display = "block";
       document.getElementById("string_cg_tsne").style.display = "none";
       document.getElementById("string_spring").style.display = "none";
       document.getElementById("string_kamada_kawai").style.display = "none";
-    } else if (name == "spring") {
+      document.getElementById("string_stress").style.display = "none";
+    } else if (
+      name == "spring" ||
+      name == "barnes_hut" ||
+      name == "multilevel"
+    ) {
       document.getElementById("string_cg_umap").style.display = "none";
       document.getElementById("string_cg_tsne").style.display = "none";
       document.getElementById("string_spring").style.display = "block";
       document.getElementById("string_kamada_kawai").style.display = "none";
+      document.getElementById("string_stress").style.display = "none";
     } else if (name == "kamada_kawai") {
       document.getElementById("string_cg_umap").style.display = "none";
       document.getElementById("string_cg_tsne").style.display = "none";
       document.getElementById("string_spring").style.display = "none";
       document.getElementById("string_kamada_kawai").style.display = "block"; // might be confusing when you cannot directly select the columns for weights
+      document.getElementById("string_stress").style.display = "none";
+    } else if (name == "stress") {
+      document.getElementById("string_cg_umap").style.display = "none";
+      document.getElementById("string_cg_tsne").style.display = "none";
+      document.getElementById("string_spring").style.display = "none";
+      document.getElementById("string_kamada_kawai").style.display = "none";
+      document.getElementById("string_stress").style.display = "block";
     } else {
       document.getElementById("string_cg_umap").style.display = "none";
       document.getElementById("string_cg_tsne").style.display = "none";
       document.getElementById("string_spring").style.display = "none";
       document.getElementById("string_kamada_kawai").style.display = "none";
+      document.getElementById("string_stress").style.display = "none";
     }
   });
 